@@ -0,0 +1 @@
+"""Throughput benchmarks on a synthetic corpus (run with ``python -m benchmarks.run``)."""
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark korean_text_quality (per page, Python loops) against
+korean_text_quality_batch (all pages in one numpy pass).
+
+The page texts come from the synthetic corpus, so the numbers reflect
+text-heavy Korean/English pages. Both scorers must agree exactly.
+
+Usage:
+    python -m benchmarks.bench_text_quality
+    python -m benchmarks.bench_text_quality --repeat 10 --corpus-dir /tmp/pdf2txt-corpus
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import fitz  # PyMuPDF
+
+from benchmarks.corpus import build_corpus
+from utils import classify_pdf
+from utils.classify_pdf import korean_text_quality, korean_text_quality_batch
+
+
+def best_time(fn, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        fn()
+        seconds = time.perf_counter() - start_time
+        best = seconds if best is None else min(best, seconds)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the text-quality scorers")
+    parser.add_argument("--corpus-dir", type=Path, default=None,
+                        help="Where to build (and reuse) the corpus (default: a temporary directory)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per scorer, best is kept (default: 5)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        texts = []
+        for _, path in build_corpus(args.corpus_dir or Path(tmp_dir)):
+            with fitz.open(path) as doc:
+                texts.extend(page.get_text() for page in doc)
+
+    chars = sum(len(t) for t in texts)
+    print(f"{len(texts)} pages, {chars} characters")
+
+    if korean_text_quality_batch(texts) != [korean_text_quality(t) for t in texts]:
+        raise SystemExit("korean_text_quality_batch disagrees with korean_text_quality")
+
+    # One-off cost of the BMP lookup tables (already built by the check above)
+    classify_pdf._BMP_SPACE = classify_pdf._BMP_CONTROL = None
+    table_seconds = best_time(classify_pdf._bmp_tables, 1)
+
+    scalar = best_time(lambda: [korean_text_quality(t) for t in texts], args.repeat)
+    batch = best_time(lambda: korean_text_quality_batch(texts), args.repeat)
+
+    print(f"lookup tables (once per process): {table_seconds * 1000:8.1f} ms")
+    print(f"korean_text_quality (per page):   {scalar * 1000:8.1f} ms  {len(texts) / scalar:10.0f} pages/s")
+    print(f"korean_text_quality_batch:        {batch * 1000:8.1f} ms  {len(texts) / batch:10.0f} pages/s")
+    print(f"speedup: {scalar / batch:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
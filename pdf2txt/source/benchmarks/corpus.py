@@ -0,0 +1,108 @@
+"""Deterministic synthetic PDF corpus for the benchmarks."""
+
+import random
+from dataclasses import dataclass
+from pathlib import Path
+
+import fitz  # PyMuPDF
+
+KOREAN_WORDS = [
+    "문서", "텍스트", "추출", "성능", "측정", "페이지", "결과", "분석", "데이터", "모델",
+    "한국어", "영어", "처리", "속도", "품질", "이미지", "레이아웃", "인식", "단락", "제목",
+]
+ENGLISH_WORDS = [
+    "document", "text", "extraction", "benchmark", "page", "layout", "column", "model",
+    "throughput", "latency", "scanned", "hybrid", "region", "render", "quality", "result",
+]
+
+PAGE_WIDTH, PAGE_HEIGHT = fitz.paper_size("a4")
+MARGIN = 50
+COLUMN_GAP = 24
+
+
+@dataclass(frozen=True)
+class DocSpec:
+    """One synthetic document of the corpus."""
+
+    name: str
+    pages: int
+    columns: int = 1
+    # 1-based page indices rendered as images only (no text layer)
+    image_pages: tuple = ()
+    all_images: bool = False
+    # Route analyze_pdf is expected to pick
+    expected_type: str = "docx"
+
+
+# Text-born documents of varying length and layout, an image-only scan and
+# a mostly-text document with a few scanned pages
+DEFAULT_CORPUS = (
+    DocSpec("text_1col_10p", pages=10),
+    DocSpec("text_2col_40p", pages=40, columns=2),
+    DocSpec("text_2col_200p", pages=200, columns=2),
+    DocSpec("scan_2col_8p", pages=8, columns=2, all_images=True, expected_type="scanned"),
+    DocSpec("mixed_2col_40p", pages=40, columns=2, image_pages=(10, 30), expected_type="mixed"),
+)
+
+
+def paragraph(rng: random.Random, words: int) -> str:
+    """Mixed Korean/English paragraph (about two thirds Korean words)."""
+    return " ".join(
+        rng.choice(KOREAN_WORDS) if rng.random() < 0.66 else rng.choice(ENGLISH_WORDS)
+        for _ in range(words)
+    ) + "."
+
+
+def draw_text_page(page, rng: random.Random, columns: int) -> None:
+    """Fill a page with a title and paragraphs flowing through ``columns`` columns."""
+    page.insert_text((MARGIN, MARGIN + 10), paragraph(rng, 6), fontname="korea", fontsize=16)
+
+    column_width = (PAGE_WIDTH - 2 * MARGIN - (columns - 1) * COLUMN_GAP) / columns
+    for col in range(columns):
+        x0 = MARGIN + col * (column_width + COLUMN_GAP)
+        rect = fitz.Rect(x0, MARGIN + 30, x0 + column_width, PAGE_HEIGHT - MARGIN)
+        paragraphs = [paragraph(rng, rng.randint(30, 60)) for _ in range(8)]
+        # insert_textbox writes nothing if the text overflows; drop paragraphs until it fits
+        while paragraphs:
+            if page.insert_textbox(rect, "\n\n".join(paragraphs), fontname="korea", fontsize=10) >= 0:
+                break
+            paragraphs.pop()
+
+
+def image_only_page(doc, text_page, dpi: int = 100) -> None:
+    """Append a page holding nothing but a grayscale JPEG render of ``text_page``."""
+    pix = text_page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY)
+    page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+    page.insert_image(page.rect, stream=pix.tobytes("jpeg", jpg_quality=60))
+
+
+def build_pdf(spec: DocSpec, path: Path, seed: int = 0) -> Path:
+    """Write the document described by ``spec``; the same seed gives the same text."""
+    rng = random.Random(f"{seed}:{spec.name}")
+    scratch = fitz.open()
+    doc = fitz.open()
+
+    for number in range(1, spec.pages + 1):
+        text_page = scratch.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        draw_text_page(text_page, rng, spec.columns)
+        if spec.all_images or number in spec.image_pages:
+            image_only_page(doc, text_page)
+        else:
+            doc.insert_pdf(scratch, from_page=text_page.number, to_page=text_page.number)
+
+    doc.save(path, garbage=3, deflate=True)
+    doc.close()
+    scratch.close()
+    return path
+
+
+def build_corpus(out_dir: Path, specs=DEFAULT_CORPUS, seed: int = 0) -> list[tuple[DocSpec, Path]]:
+    """Build every document of the corpus into ``out_dir`` (reusing existing files)."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    corpus = []
+    for spec in specs:
+        path = out_dir / f"{spec.name}_s{seed}.pdf"
+        if not path.exists():
+            build_pdf(spec, path, seed)
+        corpus.append((spec, path))
+    return corpus
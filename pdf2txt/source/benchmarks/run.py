@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+pdf2txt throughput benchmarks on a deterministic synthetic corpus.
+
+Every case runs in a fresh process so its peak RSS is its own. Cases
+report pages/sec (best of ``--repeat`` runs), peak RSS and per-stage
+latency from utils.timing. The "startup" case times ``import compare`` in
+a fresh interpreter (what a text-only run pays before its first PDF) and
+fails if that imports the OCR stack.
+
+Absolute numbers only compare on one machine, so regressions are checked
+against either a reference run (``--json`` output of e.g. the parent
+commit, passed with ``--against``) or the baselines this host stored with
+``--update-baselines`` in benchmarks/baselines.json, which is keyed by
+host and not committed.
+
+Usage:
+    python -m benchmarks.run
+    python -m benchmarks.run --cases classify pymupdf --repeat 5
+    python -m benchmarks.run --cases startup
+    python -m benchmarks.run --stub-ocr-ms 20 --stub-layout-ms 80
+    python -m benchmarks.run --real-models
+    python -m benchmarks.run --update-baselines
+    git stash && python -m benchmarks.run --json /tmp/ref.json && git stash pop
+    python -m benchmarks.run --against /tmp/ref.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from benchmarks.corpus import build_corpus
+
+# Per-host baselines ({"hosts": {host_id: {"config", "cases"}}}); not committed
+BASELINES_FILE = Path(__file__).with_name("baselines.json")
+CASES = ("startup", "classify", "pymupdf", "ocr", "hybrid")
+SOURCE_DIR = Path(__file__).resolve().parent.parent
+# Modules that importing compare.py must not load (extractors are resolved
+# lazily, so only runs that meet a scanned or mixed PDF pay for them)
+HEAVY_MODULES = ("extractors.ocr_extractor", "extractors.hybrid_extractor", "PIL", "paddleocr", "paddle")
+
+
+def host_id() -> str:
+    """Identify this machine and interpreter for per-host baselines."""
+    return (f"{platform.node()}/{platform.machine()}/{os.cpu_count()}cpu/"
+            f"py{platform.python_version_tuple()[0]}.{platform.python_version_tuple()[1]}")
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process, or None if it cannot be read."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        try:
+            import psutil
+        except ImportError:
+            return None
+        return psutil.Process().memory_info().peak_wset / 2**20
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, kilobytes elsewhere
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def measure_startup(repeat: int) -> dict:
+    """
+    Time ``import compare`` in fresh interpreters (best of ``repeat``),
+    less a bare interpreter start, and list the heavy modules it loaded.
+    """
+    probe = (
+        "import json, sys, time; start = time.perf_counter(); import compare; "
+        "seconds = time.perf_counter() - start; "
+        f"print(json.dumps([seconds, [m for m in {HEAVY_MODULES!r} if m in sys.modules]]))"
+    )
+    best_import = best_total = None
+    heavy = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", probe], cwd=SOURCE_DIR, capture_output=True,
+                             text=True, check=True).stdout
+        total = time.perf_counter() - start_time
+        import_seconds, heavy = json.loads(out.splitlines()[-1])
+        best_import = import_seconds if best_import is None else min(best_import, import_seconds)
+        best_total = total if best_total is None else min(best_total, total)
+    return {
+        "import_seconds": round(best_import, 4),
+        "process_seconds": round(best_total, 4),
+        "heavy_modules": heavy,
+    }
+
+
+def make_ocr_extractor(options: dict):
+    from extractors import OCRExtractor
+
+    if options["real_models"]:
+        return OCRExtractor()
+
+    from benchmarks.stubs import StubLayoutDetection, StubPaddleOCR
+
+    return OCRExtractor(
+        layout_predictor=StubLayoutDetection(options["stub_layout_ms"] / 1000),
+        ocr_predictor=StubPaddleOCR(options["stub_ocr_ms"] / 1000),
+    )
+
+
+def run_case(case: str, corpus: list, options: dict) -> dict:
+    """Run one benchmark case (in a worker process) and return its measurements."""
+    if case == "startup":
+        return measure_startup(options["repeat"])
+
+    import fitz  # PyMuPDF
+
+    from extractors import HybridExtractor, PyMuPDFExtractor
+    from utils import timing
+    from utils.classify_pdf import analyze_pdf
+
+    if case == "classify":
+        docs = list(corpus)
+    elif case == "pymupdf":
+        docs = [(spec, path) for spec, path in corpus if spec.expected_type == "docx"]
+    elif case == "ocr":
+        docs = [(spec, path) for spec, path in corpus if spec.expected_type == "scanned"]
+    else:
+        docs = [(spec, path) for spec, path in corpus if spec.expected_type == "mixed"]
+
+    load_start = time.perf_counter()
+    if case == "pymupdf":
+        extractor = PyMuPDFExtractor()
+    elif case == "ocr":
+        extractor = make_ocr_extractor(options)
+    elif case == "hybrid":
+        extractor = HybridExtractor(ocr_extractor=make_ocr_extractor(options))
+    load_seconds = time.perf_counter() - load_start
+
+    pages = 0
+    for _, path in docs:
+        with fitz.open(path) as doc:
+            pages += len(doc)
+
+    timing.enable()
+    best = None
+    mismatches = []
+    for _ in range(options["repeat"]):
+        with timing.recording() as stages:
+            start_time = time.perf_counter()
+            for spec, path in docs:
+                if case == "classify":
+                    pdf_type = analyze_pdf(str(path)).pdf_type
+                    if pdf_type != spec.expected_type:
+                        mismatches.append(f"{spec.name}: {pdf_type} (expected {spec.expected_type})")
+                else:
+                    for _ in extractor.extract_pages(path):
+                        pass
+            seconds = time.perf_counter() - start_time
+        if best is None or seconds < best[0]:
+            best = (seconds, stages.as_dict())
+
+    seconds, stages = best
+    return {
+        "documents": len(docs),
+        "pages": pages,
+        "seconds": round(seconds, 4),
+        "pages_per_sec": round(pages / seconds, 2) if seconds else 0.0,
+        "model_load_seconds": round(load_seconds, 4),
+        "peak_rss_mb": round(peak_rss_mb() or 0.0, 1),
+        "stages": {
+            name: {
+                "count": s["count"],
+                "mean_ms": round(s["total_seconds"] / s["count"] * 1000, 3),
+                "total_seconds": s["total_seconds"],
+            }
+            for name, s in stages.items()
+        },
+        "classification_mismatches": sorted(set(mismatches)),
+    }
+
+
+def compare_with_baselines(results: dict, baselines: dict, tolerance: float) -> list[str]:
+    """
+    Cases whose pages/sec fell more than ``tolerance`` below their baseline
+    (stored, or a reference run's result), or whose startup import got that
+    much slower or loads the OCR stack.
+    """
+    regressions = []
+    for case, result in results.items():
+        if case == "startup" and result["heavy_modules"]:
+            regressions.append(f"startup: import compare loads {', '.join(result['heavy_modules'])}")
+        baseline = baselines.get(case)
+        if not baseline:
+            continue
+        if case == "startup":
+            ceiling = baseline["import_seconds"] * (1 + tolerance)
+            if result["import_seconds"] > ceiling:
+                regressions.append(
+                    f"startup: import took {result['import_seconds'] * 1000:.0f} ms > "
+                    f"{ceiling * 1000:.0f} (baseline {baseline['import_seconds'] * 1000:.0f} + {tolerance:.0%})"
+                )
+            continue
+        floor = baseline["pages_per_sec"] * (1 - tolerance)
+        if result["pages_per_sec"] < floor:
+            regressions.append(
+                f"{case}: {result['pages_per_sec']:.1f} pages/s < "
+                f"{floor:.1f} (baseline {baseline['pages_per_sec']:.1f} - {tolerance:.0%})"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pdf2txt on a synthetic corpus")
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=list(CASES))
+    parser.add_argument("--corpus-dir", type=Path, default=None,
+                        help="Where to build (and reuse) the corpus (default: a temporary directory)")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus seed (default: 0)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case, best is kept (default: 3)")
+    parser.add_argument("--real-models", action="store_true",
+                        help="Use PaddleOCR and PP-DocLayoutV2 instead of the stub models")
+    parser.add_argument("--stub-layout-ms", type=float, default=0.0,
+                        help="Simulated layout latency per page of the stub model (default: 0)")
+    parser.add_argument("--stub-ocr-ms", type=float, default=0.0,
+                        help="Simulated OCR latency per region of the stub model (default: 0)")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed pages/sec drop below baseline before flagging (default: 0.25)")
+    parser.add_argument("--json", type=Path, default=None, help="Also write the results to this file")
+    parser.add_argument("--against", type=Path, default=None,
+                        help="Compare with the --json output of a reference run on this machine "
+                             "instead of the stored baselines")
+    parser.add_argument("--update-baselines", action="store_true",
+                        help=f"Store these results as this host's baselines in {BASELINES_FILE.name}")
+    args = parser.parse_args()
+
+    options = {
+        "repeat": max(1, args.repeat),
+        "real_models": args.real_models,
+        "stub_layout_ms": args.stub_layout_ms,
+        "stub_ocr_ms": args.stub_ocr_ms,
+    }
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        corpus = build_corpus(args.corpus_dir or Path(tmp_dir), seed=args.seed)
+
+        results = {}
+        for case in args.cases:
+            # A fresh process per case keeps peak RSS and model state separate
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+                results[case] = executor.submit(run_case, case, corpus, options).result()
+
+    print(f"{'Case':<10} {'Docs':>5} {'Pages':>6} {'Pages/s':>9} {'Peak RSS (MB)':>14}  Slowest stages (mean ms)")
+    for case, r in results.items():
+        if case == "startup":
+            continue
+        slowest = sorted(r["stages"].items(), key=lambda item: -item[1]["total_seconds"])[:3]
+        stage_note = ", ".join(f"{name} {s['mean_ms']:.2f}" for name, s in slowest)
+        print(f"{case:<10} {r['documents']:>5} {r['pages']:>6} {r['pages_per_sec']:>9.1f} "
+              f"{r['peak_rss_mb']:>14.1f}  {stage_note}")
+        for mismatch in r["classification_mismatches"]:
+            print(f"  classification mismatch: {mismatch}")
+
+    startup = results.get("startup")
+    if startup:
+        print(f"\nStartup: import compare {startup['import_seconds'] * 1000:.0f} ms "
+              f"({startup['process_seconds'] * 1000:.0f} ms with interpreter start); "
+              f"heavy modules loaded: {', '.join(startup['heavy_modules']) or 'none'}")
+
+    # Numbers are only comparable on the same host and configuration
+    host = host_id()
+    config = {"seed": args.seed, **{k: v for k, v in options.items() if k != "repeat"}}
+
+    if args.json:
+        run = {"host": host, "config": config, "cases": results}
+        args.json.write_text(json.dumps(run, indent=2), encoding="utf-8")
+
+    hosts = {}
+    if BASELINES_FILE.exists():
+        hosts = json.loads(BASELINES_FILE.read_text(encoding="utf-8")).get("hosts", {})
+
+    if args.update_baselines:
+        stored = {"config": config, "cases": {}}
+        previous = hosts.get(host)
+        if previous and previous.get("config") == config:
+            stored["cases"] = previous["cases"]  # keep the cases not run this time
+        stored["cases"].update(
+            {
+                case: {"import_seconds": r["import_seconds"]} if case == "startup"
+                else {"pages_per_sec": r["pages_per_sec"]}
+                for case, r in results.items()
+            }
+        )
+        hosts[host] = stored
+        BASELINES_FILE.write_text(json.dumps({"hosts": hosts}, indent=2) + "\n", encoding="utf-8")
+        print(f"\nBaselines of {host} written to {BASELINES_FILE}")
+        return
+
+    if args.against:
+        reference = json.loads(args.against.read_text(encoding="utf-8"))
+        label = f"reference run {args.against}"
+        if reference.get("host") != host:
+            print(f"\nWarning: the reference run was taken on {reference.get('host')}, not {host}")
+    else:
+        reference = hosts.get(host)
+        label = "baselines"
+        if reference is None:
+            print(f"\nNo baselines for {host}; store them with --update-baselines or compare with --against")
+            return
+    if reference.get("config") != config:
+        print(f"\nThe {label} used a different configuration; not compared")
+        return
+
+    regressions = compare_with_baselines(results, reference["cases"], args.tolerance)
+    if regressions:
+        print("\nRegressions:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"\nNo regressions against the {label}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Stand-ins for the PaddleOCR models, so the OCR path can be benchmarked without them."""
+
+import time
+
+
+class _Result:
+    """Mimics a PaddleX Result: the payload lives under ``.json["res"]``."""
+
+    def __init__(self, res: dict):
+        self.json = {"res": res}
+
+
+class StubLayoutDetection:
+    """
+    Layout model returning a fixed two-column grid of text regions per page.
+
+    Args:
+        seconds_per_image: Simulated inference latency per page image
+    """
+
+    def __init__(self, seconds_per_image: float = 0.0):
+        self.seconds_per_image = seconds_per_image
+
+    def predict(self, images, batch_size: int = 1, layout_nms: bool = True) -> list:
+        if not isinstance(images, list):
+            images = [images]
+        time.sleep(self.seconds_per_image * len(images))
+
+        results = []
+        for img in images:
+            h, w = img.shape[:2]
+            boxes = [{"label": "paragraph_title", "coordinate": [w * 0.08, h * 0.05, w * 0.92, h * 0.09]}]
+            for x0, x1 in ((0.08, 0.48), (0.52, 0.92)):
+                for y in range(4):
+                    y0 = 0.1 + y * 0.21
+                    boxes.append({"label": "text", "coordinate": [w * x0, h * y0, w * x1, h * (y0 + 0.19)]})
+            results.append(_Result({"boxes": boxes}))
+        return results
+
+
+class StubPaddleOCR:
+    """
+    OCR model "recognizing" one line per crop that encodes the crop size.
+
+    Args:
+        seconds_per_image: Simulated inference latency per region crop
+    """
+
+    def __init__(self, seconds_per_image: float = 0.0):
+        self.seconds_per_image = seconds_per_image
+
+    def predict(self, images) -> list:
+        if not isinstance(images, list):
+            images = [images]
+        time.sleep(self.seconds_per_image * len(images))
+        return [_Result({"rec_texts": [f"region {img.shape[1]}x{img.shape[0]}"]}) for img in images]
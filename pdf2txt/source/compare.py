@@ -2,34 +2,190 @@
 """
 PDF Text Extraction Tool
 
-This script extracts text from PDFs by automatically classifying them as scanned
-or docx-based, then using the appropriate extractor (OCRExtractor for scanned,
-PyMuPDF for docx-based).
+This script extracts text from PDFs by automatically classifying them as scanned,
+mixed or docx-based, then using the appropriate extractor (OCRExtractor for
+scanned, HybridExtractor for mixed, PyMuPDF for docx-based).
 
 Usage:
     pdm run python compare.py samples/
     pdm run python compare.py samples/sample.pdf
     pdm run python compare.py samples/ --output-dir results/
+    pdm run python compare.py samples/ --workers 8
+    pdm run python compare.py samples/ --resume
+    pdm run python compare.py --rebuild-report --output-dir results/
+    pdm run python compare.py samples/ --timings
 """
 
 import argparse
+import glob
 import json
+import shutil
 import sys
+import time
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional, TextIO, Union
+
+import fitz  # PyMuPDF
 
 from extractors import (
     ExtractionResult,
-    PyMuPDFExtractor,
-    OCRExtractor,
+    ExtractorPool,
+    default_pool,
+    get_extractor_class,
+    init_default_pool,
+    write_pages,
 )
-from utils.classify_pdf import classify_pdf
+from utils.classify_pdf import PdfAnalysis, analyze_pdf
+from utils.extraction_cache import ExtractionCache, cache_key, file_sha256
+from utils.manifest import MANIFEST_NAME, Manifest, load_manifest
+from utils.report_stats import ReportAggregator
+from utils.worker_pool import TaskOutcome, WorkerPool, report_progress, reported_pages, rss_mb
+from utils import timing
+
+# Extractor (registry name) for each classification; a module is only
+# imported once a PDF of its type shows up
+EXTRACTOR_FOR_TYPE = {
+    "docx": "PyMuPDFExtractor",
+    "mixed": "HybridExtractor",
+    "scanned": "OCRExtractor",
+}
+
+# Extractors whose models are worth warming up ahead of the first PDF that
+# needs them (HybridExtractor shares the OCRExtractor's models)
+WARM_UP_EXTRACTOR = "OCRExtractor"
+NEEDS_WARM_UP = {"mixed", "scanned"}
+
+# Extractor running the page-range shards of large scanned PDFs
+SHARD_EXTRACTOR = "OCRExtractor"
+
+# Extractor OCRing grouped small scanned PDFs through one page stream
+GROUP_EXTRACTOR = "OCRExtractor"
+
+# Extraction cache, output directory, analyze_pdf options and --warmup
+# mode of a batch worker process (set by _init_worker)
+_worker_cache: Optional[ExtractionCache] = None
+_worker_output_dir: Optional[Path] = None
+_worker_classify_options: dict = {}
+_worker_warmup = "off"
+
+
+def text_output_path(output_dir: Path, pdf_path: Path, extractor_name: str) -> Path:
+    """File the text of one extractor's result on ``pdf_path`` is saved to."""
+    return output_dir / f"{pdf_path.stem}_{extractor_name}.txt"
+
+
+def shard_output_path(output_file: Path, start: int) -> Path:
+    """File the text of the shard starting at page ``start`` is saved to, until merged."""
+    return output_file.with_name(f"{output_file.name}.shard-{start:06d}")
+
+
+def _cached_result(
+    entry: dict,
+    lookup_time: float,
+    text_file: Optional[Path] = None,
+    output_file: Optional[Path] = None,
+) -> ExtractionResult:
+    """
+    Rebuild an ExtractionResult from a cache entry.
+    
+    The text of an entry stored with a text file is copied to
+    ``output_file`` (and only read into memory without one).
+    
+    Args:
+        entry: Cache entry
+        lookup_time: Seconds the lookup took
+        text_file: Text file of the entry (``ExtractionCache.text_path``)
+        output_file: Optional file the text is saved to
+    """
+    metadata = dict(entry.get("metadata", {}))
+    # Counters and timings of the run that filled the entry
+    metadata.pop("page_cache", None)
+    metadata.pop("region_cache", None)
+    metadata.pop("worker_recycles", None)
+    metadata.pop("timings", None)
+    metadata["cache"] = "hit"
+    metadata["cached_execution_time_seconds"] = entry["execution_time_seconds"]
+    result = ExtractionResult(
+        extractor_name=entry["extractor_name"],
+        text=entry.get("text", ""),
+        success=True,
+        execution_time_seconds=lookup_time,
+        char_count=entry["char_count"],
+        word_count=entry["word_count"],
+        line_count=entry["line_count"],
+        metadata=metadata,
+    )
+    if entry.get("text_file"):
+        if output_file is not None:
+            shutil.copyfile(text_file, output_file)
+            result.output_file = str(output_file)
+        else:
+            result.text = Path(text_file).read_text(encoding="utf-8")
+    return result
+
+
+def classify_document(
+    pdf_path: Path,
+    cache: Optional[ExtractionCache],
+    classify_options: dict,
+) -> tuple[str, Optional[PdfAnalysis], Optional[str]]:
+    """
+    Classify a PDF, through the extraction cache if there is one.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        cache: Optional extraction cache keyed by the PDF's content
+        classify_options: Keyword arguments of analyze_pdf
+        
+    Returns:
+        Tuple of (pdf_type, analysis, content_hash); the analysis is None
+        when the type came from the cache, the hash None without a cache
+    """
+    content_hash = file_sha256(pdf_path) if cache is not None else None
+    
+    if cache is not None:
+        entry = cache.get(cache_key(content_hash, "classify_pdf", classify_options))
+        if entry is not None:
+            return entry["pdf_type"], None, content_hash
+    
+    # Classify PDF; the parsed pages are handed on to the extractor
+    with timing.span("classify"):
+        analysis = analyze_pdf(str(pdf_path), **classify_options)
+    if cache is not None:
+        cache.put(cache_key(content_hash, "classify_pdf", classify_options), {"pdf_type": analysis.pdf_type})
+    return analysis.pdf_type, analysis, content_hash
+
+
+def cache_entry(result: ExtractionResult) -> dict:
+    """
+    Extraction-cache entry of a successful result. The text is embedded
+    unless it was streamed to ``result.output_file``, which is then stored
+    alongside the entry (``ExtractionCache.put(..., text_file=...)``).
+    """
+    entry = {
+        "extractor_name": result.extractor_name,
+        "execution_time_seconds": result.execution_time_seconds,
+        "char_count": result.char_count,
+        "word_count": result.word_count,
+        "line_count": result.line_count,
+        "metadata": result.metadata,
+    }
+    if result.output_file is None:
+        entry["text"] = result.text
+    return entry
 
 
 def run_extraction(
     pdf_path: Path,
     verbose: bool = True,
+    pool: Optional[ExtractorPool] = None,
+    cache: Optional[ExtractionCache] = None,
+    output_dir: Optional[Path] = None,
+    classify_options: Optional[dict] = None,
+    classified: Optional[tuple] = None,
+    timings: Optional[timing.StageTimings] = None,
 ) -> list[ExtractionResult]:
     """
     Run appropriate extractor based on PDF classification.
@@ -37,36 +193,92 @@ def run_extraction(
     Args:
         pdf_path: Path to the PDF file
         verbose: Print progress
+        pool: Extractor pool to reuse loaded extractors from
+              (default: the process-wide pool)
+        cache: Optional extraction cache keyed by the PDF's content
+        output_dir: Optional directory the text is streamed to page by page
+                    (see save_results); results then carry no text
+        classify_options: Optional keyword arguments of analyze_pdf
+                          (e.g. ``{"sample": True}``)
+        classified: Optional ``classify_document`` output computed ahead
+                    (e.g. for a PDF deferred until its models are warm)
+        timings: Optional StageTimings already holding spans of this
+                 document (such as its classification)
         
     Returns:
         List containing single extraction result
     """
+    if pool is None:
+        pool = default_pool()
+    
+    # Stage spans of this document (None unless timing is enabled)
+    with timing.recording(timings) as timings:
+        results = _run_extraction(pdf_path, verbose, pool, cache, output_dir, classify_options or {}, classified)
+    if timings is not None:
+        results[0].metadata["timings"] = timings.as_dict()
+    return results
+
+
+def _run_extraction(
+    pdf_path: Path,
+    verbose: bool,
+    pool: ExtractorPool,
+    cache: Optional[ExtractionCache],
+    output_dir: Optional[Path],
+    classify_options: dict,
+    classified: Optional[tuple],
+) -> list[ExtractionResult]:
     try:
-        # Classify PDF
-        pdf_type = classify_pdf(str(pdf_path))
+        start_time = time.perf_counter()
+        if classified is None:
+            classified = classify_document(pdf_path, cache, classify_options)
+        pdf_type, analysis, content_hash = classified
+        report_progress("pdf_type", pdf_type)
         
         if verbose:
             print(f"  PDF type: {pdf_type}", end=" ", flush=True)
+            if analysis is not None and not analysis.complete:
+                print(f"({len(analysis.pages)}/{analysis.total_pages} pages inspected)", end=" ", flush=True)
         
         # Select extractor based on classification
-        if pdf_type == "docx":
-            extractor = PyMuPDFExtractor()
-        elif pdf_type == "scanned":
-            extractor = OCRExtractor()
-        else:
+        if pdf_type not in EXTRACTOR_FOR_TYPE:
             raise ValueError(f"Unexpected PDF classification: {pdf_type}")
+        extractor_cls = get_extractor_class(EXTRACTOR_FOR_TYPE[pdf_type])
         
         if verbose:
-            print(f"→ Using {extractor.name}...", end=" ", flush=True)
+            print(f"→ Using {extractor_cls.name}...", end=" ", flush=True)
+        
+        output_file = None
+        if output_dir is not None:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            output_file = text_output_path(output_dir, pdf_path, extractor_cls.name)
         
-        # Run extraction with timing
-        result = extractor.extract_with_timing(pdf_path)
+        result = None
+        if cache is not None:
+            key = cache_key(content_hash, extractor_cls.name, pool.cache_config(extractor_cls))
+            entry = cache.get(key)
+            if entry is not None:
+                try:
+                    result = _cached_result(entry, time.perf_counter() - start_time, cache.text_path(key), output_file)
+                except OSError:
+                    result = None  # text evicted since the lookup; extract again
+        
+        if result is None:
+            # Run extraction with timing (model load is reported separately)
+            with timing.span("extract"):
+                result = pool.extract_with_timing(extractor_cls, pdf_path, analysis, output_file, report_progress)
+            if cache is not None:
+                result.metadata["cache"] = "miss"
+                if result.success:
+                    # A streamed text is copied file to file, never loaded
+                    cache.put(key, cache_entry(result), text_file=result.output_file)
+        result.metadata.setdefault("pdf_type", pdf_type)
+        if analysis is not None:
+            result.metadata["classification"] = analysis.summary()
+        result.content_hash = content_hash
         
         if verbose:
-            if result.success:
-                print(f"✓ ({result.execution_time_seconds:.2f}s, {result.word_count} words)")
-            else:
-                print(f"✗ ({result.error_message[:50]}...)")
+            print(format_status(result))
         
         return [result]
         
@@ -85,17 +297,717 @@ def run_extraction(
         return [error_result]
 
 
+def format_status(result: ExtractionResult) -> str:
+    """Format the one-line progress status of an extraction result."""
+    if not result.success:
+        return f"✗ ({(result.error_message or '')[:50]}...)"
+    
+    load_note = (
+        f", model load {result.model_load_time_seconds:.2f}s"
+        if result.model_load_time_seconds else ""
+    )
+    return f"✓ ({result.execution_time_seconds:.2f}s, {result.word_count} words{load_note})"
+
+
+def _init_worker(
+    extractor_options: dict[str, dict],
+    cache: Optional[ExtractionCache],
+    output_dir: Optional[Path],
+    timings: bool,
+    classify_options: dict,
+    warmup: str = "off",
+) -> None:
+    """Create the worker's extractor pool once, before any task runs."""
+    global _worker_cache, _worker_output_dir, _worker_classify_options, _worker_warmup
+    timing.enable(timings)
+    pool = init_default_pool(extractor_options)
+    if warmup == "always":
+        pool.warm_up(WARM_UP_EXTRACTOR)
+    _worker_cache = cache
+    _worker_output_dir = output_dir
+    _worker_classify_options = classify_options
+    _worker_warmup = warmup
+
+
+def _warm_up_for(pdf_type: str) -> None:
+    """With --warmup auto, start loading the OCR models once the worker meets a PDF that needs them."""
+    if _worker_warmup == "auto" and pdf_type in NEEDS_WARM_UP:
+        default_pool().warm_up(WARM_UP_EXTRACTOR)
+
+
+def _extract_in_worker(pdf_path: Path, shard_pages: int = 0) -> Union[list[ExtractionResult], "ShardPlan"]:
+    """
+    Process-pool task: classify and extract one PDF with the worker's pool,
+    or return a ShardPlan if it is to be OCR'd in shards (``plan_shards``).
+    With --warmup auto, a scanned or mixed PDF starts the model warm-up,
+    which then loads while the shards are planned and queued.
+    """
+    classified = None
+    with timing.recording() as timings:
+        if shard_pages > 0 or _worker_warmup == "auto":
+            try:
+                classified = classify_document(pdf_path, _worker_cache, _worker_classify_options)
+            except Exception:
+                classified = None  # run_extraction reports the error
+            else:
+                _warm_up_for(classified[0])
+                plan = None
+                if shard_pages > 0:
+                    plan = plan_shards(pdf_path, classified, shard_pages, default_pool(), _worker_cache)
+                if plan is not None:
+                    plan.timings = timings.as_dict() if timings is not None else {}
+                    return plan
+    
+    return run_extraction(
+        pdf_path,
+        verbose=False,
+        cache=_worker_cache,
+        output_dir=_worker_output_dir,
+        classify_options=_worker_classify_options,
+        classified=classified,
+        timings=timings,
+    )
+
+
+def _extract_shard_in_worker(pdf_path: Path, start: int, stop: int) -> list[ExtractionResult]:
+    """Process-pool task: OCR pages ``start`` to ``stop`` of a scanned PDF."""
+    with timing.recording() as timings:
+        try:
+            extractor, load_time = default_pool().get(SHARD_EXTRACTOR)
+            report_progress("extractor", {"name": extractor.name, "page_separator": extractor.page_separator})
+            report_progress("pages", 1)
+            start_time = time.perf_counter()
+            metadata = {}
+            output_file = None
+            if _worker_output_dir is not None:
+                output_file = shard_output_path(text_output_path(_worker_output_dir, pdf_path, extractor.name), start)
+            with timing.span("extract"):
+                # Without a file to stream to, the pages come back on a timeout
+                pages = reported_pages(
+                    extractor.extract_page_range(pdf_path, start, stop, metadata, report_progress),
+                    keep=output_file is None,
+                )
+                if output_file is None:
+                    text = extractor.page_separator.join(pages)
+                    streamed = {}
+                else:
+                    counter = write_pages(pages, output_file, extractor.page_separator)
+                    text = ""
+                    streamed = {
+                        "char_count": counter.char_count,
+                        "word_count": counter.word_count,
+                        "line_count": counter.line_count,
+                        "output_file": str(output_file),
+                    }
+            result = ExtractionResult(
+                extractor_name=extractor.name,
+                text=text,
+                success=True,
+                execution_time_seconds=time.perf_counter() - start_time,
+                model_load_time_seconds=load_time,
+                metadata=metadata,
+                **streamed,
+            )
+        except Exception as e:
+            result = ExtractionResult(
+                extractor_name=get_extractor_class(SHARD_EXTRACTOR).name,
+                text="",
+                success=False,
+                error_message=f"{type(e).__name__}: {e} (pages {start + 1}-{stop})",
+            )
+    if timings is not None:
+        result.metadata["timings"] = timings.as_dict()
+    return [result]
+
+
+def _extract_group_in_worker(
+    pdf_paths: list[Path],
+    shard_pages: int = 0,
+) -> list[tuple[Path, Union[list[ExtractionResult], "ShardPlan"]]]:
+    """
+    Process-pool task: classify and extract several small PDFs, OCRing the
+    scanned ones without a cached result through one page stream, so their
+    pages share layout batches (``OCRExtractor.extract_documents``).
+    
+    Groups are planned by file size, so a scanned PDF of more than
+    ``shard_pages`` pages gets a ShardPlan as in ``_extract_in_worker``.
+    The other PDFs are extracted one at a time as by ``_extract_in_worker``,
+    and so are the grouped ones if the shared stream fails, so an error
+    lands on the PDF that caused it. Text-only PDFs go first, so with
+    --warmup auto the OCR models load (from the first scanned or mixed PDF
+    on) while the rest of the group is classified and extracted.
+    
+    Returns:
+        (pdf_path, results or ShardPlan) of every PDF, in ``pdf_paths`` order
+    """
+    pool = default_pool()
+    done = {}
+    grouped = []  # (pdf_path, classified, timings) of the scanned PDFs
+    deferred = []  # the same of the mixed PDFs, extracted after the text-only ones
+    for pdf_path in pdf_paths:
+        with timing.recording() as timings:
+            try:
+                classified = classify_document(pdf_path, _worker_cache, _worker_classify_options)
+            except Exception:
+                classified = None  # run_extraction reports the error
+        
+        if classified is not None:
+            _warm_up_for(classified[0])
+            if classified[0] == "mixed":
+                deferred.append((pdf_path, classified, timings))
+                continue
+        if classified is not None and classified[0] == "scanned":
+            if shard_pages > 0:
+                plan = plan_shards(pdf_path, classified, shard_pages, pool, _worker_cache)
+                if plan is not None:
+                    plan.timings = timings.as_dict() if timings is not None else {}
+                    done[pdf_path] = plan
+                    continue
+            content_hash = classified[2]
+            key = None
+            if _worker_cache is not None:
+                key = cache_key(content_hash, get_extractor_class(GROUP_EXTRACTOR).name, pool.cache_config(GROUP_EXTRACTOR))
+            if key is None or _worker_cache.get(key) is None:
+                grouped.append((pdf_path, classified, timings))
+                continue
+        done[pdf_path] = run_extraction(
+            pdf_path,
+            verbose=False,
+            cache=_worker_cache,
+            output_dir=_worker_output_dir,
+            classify_options=_worker_classify_options,
+            classified=classified,
+            timings=timings,
+        )
+    
+    if len(grouped) > 1:
+        done.update(_ocr_group(grouped, pool))
+    for pdf_path, classified, timings in grouped + deferred:
+        if pdf_path not in done:
+            done[pdf_path] = run_extraction(
+                pdf_path,
+                verbose=False,
+                cache=_worker_cache,
+                output_dir=_worker_output_dir,
+                classify_options=_worker_classify_options,
+                classified=classified,
+                timings=timings,
+            )
+    return [(pdf_path, done[pdf_path]) for pdf_path in pdf_paths]
+
+
+def _ocr_group(grouped: list[tuple], pool: ExtractorPool) -> dict[Path, list[ExtractionResult]]:
+    """
+    OCR classified scanned PDFs through one page stream and split the
+    results back out per PDF.
+    
+    Stream time, pipeline counters and stage spans are shared out by page
+    count; the model load time goes to the first PDF.
+    
+    Args:
+        grouped: (pdf_path, classified, timings) of each PDF
+        pool: The worker's extractor pool
+    
+    Returns:
+        pdf_path -> results, or an empty dict if the stream failed
+    """
+    extractor, load_time = pool.get(GROUP_EXTRACTOR)
+    pdf_paths = [pdf_path for pdf_path, _, _ in grouped]
+    metadata = [{} for _ in grouped]
+    texts = {}
+    streamed = {}
+    start_time = time.perf_counter()
+    with timing.recording() as group_timings:
+        try:
+            with timing.span("extract"):
+                for i, pages in extractor.extract_documents(pdf_paths, metadata, report_progress):
+                    if _worker_output_dir is None:
+                        texts[i] = extractor.page_separator.join(pages)
+                        continue
+                    _worker_output_dir.mkdir(parents=True, exist_ok=True)
+                    output_file = text_output_path(_worker_output_dir, pdf_paths[i], extractor.name)
+                    counter = write_pages(pages, output_file, extractor.page_separator)
+                    streamed[i] = {
+                        "char_count": counter.char_count,
+                        "word_count": counter.word_count,
+                        "line_count": counter.line_count,
+                        "output_file": str(output_file),
+                    }
+        except Exception:
+            return {}
+    execution_time = time.perf_counter() - start_time
+    
+    page_counts = [m["pipeline"]["pages"] for m in metadata]
+    total_pages = sum(page_counts)
+    weights = [n / total_pages if total_pages else 1 / len(grouped) for n in page_counts]
+    span_shares = timing.split_stages(group_timings.as_dict(), weights) if group_timings is not None else None
+    
+    done = {}
+    for i, (pdf_path, (pdf_type, analysis, content_hash), doc_timings) in enumerate(grouped):
+        result = ExtractionResult(
+            extractor_name=extractor.name,
+            text=texts.get(i, ""),
+            success=True,
+            execution_time_seconds=execution_time * weights[i],
+            model_load_time_seconds=load_time if i == 0 else 0.0,
+            metadata=metadata[i],
+            **streamed.get(i, {}),
+        )
+        result.metadata["group"] = {"documents": len(grouped), "pages": total_pages}
+        if _worker_cache is not None:
+            result.metadata["cache"] = "miss"
+            key = cache_key(content_hash, extractor.name, pool.cache_config(GROUP_EXTRACTOR))
+            _worker_cache.put(key, cache_entry(result), text_file=result.output_file)
+        result.metadata["pdf_type"] = pdf_type
+        if analysis is not None:
+            result.metadata["classification"] = analysis.summary()
+        result.content_hash = content_hash
+        if doc_timings is not None:
+            doc_timings.merge(span_shares[i])
+            result.metadata["timings"] = doc_timings.as_dict()
+        done[pdf_path] = [result]
+    return done
+
+
+def plan_groups(pdf_files: list[Path], group_bytes: int) -> list[list[Path]]:
+    """
+    Pack PDFs smaller than ``group_bytes``, in the given order, into groups
+    of at most ``group_bytes`` in total; every other PDF is a group of its
+    own. Only file sizes are read, so planning parses no PDF and no
+    deadline is needed for it.
+    """
+    groups = []
+    group = []
+    group_total = 0
+    for pdf_path in pdf_files:
+        size = pdf_path.stat().st_size
+        if size >= group_bytes:
+            groups.append([pdf_path])
+            continue
+        if group and group_total + size > group_bytes:
+            groups.append(group)
+            group = []
+            group_total = 0
+        group.append(pdf_path)
+        group_total += size
+    if group:
+        groups.append(group)
+    return groups
+
+
+@dataclass
+class ShardPlan:
+    """A classified PDF to be OCR'd in page-range shards."""
+    
+    pdf_type: str
+    content_hash: Optional[str]
+    classification: Optional[dict]  # PdfAnalysis.summary(), if classified afresh
+    ranges: list[tuple[int, int]]  # (start, stop) page ranges
+    timings: dict = field(default_factory=dict)  # spans of the classification
+
+
+def plan_shards(
+    pdf_path: Path,
+    classified: tuple,
+    shard_pages: int,
+    pool: ExtractorPool,
+    cache: Optional[ExtractionCache],
+) -> Optional[ShardPlan]:
+    """
+    Decide whether a PDF is OCR'd in page-range shards.
+    
+    Only scanned PDFs of more than ``shard_pages`` pages without a cached
+    result are sharded. Runs in a worker, right after it classified the PDF.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        classified: ``classify_document`` output of the PDF
+        shard_pages: Pages per shard
+        pool: Extractor pool giving the cache config
+        cache: Optional extraction cache
+        
+    Returns:
+        ShardPlan, or None to extract the PDF whole
+    """
+    pdf_type, analysis, content_hash = classified
+    if pdf_type != "scanned":
+        return None
+    if analysis is not None:
+        page_count = analysis.total_pages
+    else:
+        with fitz.open(pdf_path) as doc:
+            page_count = len(doc)
+    if page_count <= shard_pages:
+        return None
+    if cache is not None:
+        key = cache_key(content_hash, get_extractor_class(SHARD_EXTRACTOR).name, pool.cache_config(SHARD_EXTRACTOR))
+        if cache.get(key) is not None:
+            return None
+    
+    return ShardPlan(
+        pdf_type=pdf_type,
+        content_hash=content_hash,
+        classification=analysis.summary() if analysis is not None else None,
+        ranges=[(start, min(start + shard_pages, page_count)) for start in range(0, page_count, shard_pages)],
+    )
+
+
+def merge_shard_results(
+    shards: list[ExtractionResult],
+    shard_pages: int,
+    plan_timings: Optional[dict] = None,
+    output_file: Optional[Path] = None,
+) -> ExtractionResult:
+    """
+    Combine the shard results of one PDF, in page order, into one result.
+    
+    The texts are joined like the pages of an unsharded extraction. Times
+    and pipeline counters are summed over the shards (worker time, not
+    wall time); any failed shard fails the document, keeping the text of
+    the shards (and pages of timed-out shards) that completed.
+    
+    Args:
+        shards: Shard results in page order
+        shard_pages: Pages per shard
+        plan_timings: Optional stage timings of the classification that
+                      planned the shards
+        output_file: Optional file the shard texts are concatenated into,
+                     one shard at a time (shard files are then removed);
+                     the result carries the counts and ``output_file`` but
+                     no text
+    """
+    extractor_cls = get_extractor_class(SHARD_EXTRACTOR)
+    metadata = {"shards": {"count": len(shards), "pages_per_shard": shard_pages}}
+    pipeline = {}
+    region_cache = {}
+    blank_pages = []
+    worker_recycles = []
+    timings = timing.StageTimings()
+    timings.merge(plan_timings or {})
+    for r in shards:
+        for name, value in r.metadata.get("pipeline", {}).items():
+            pipeline[name] = pipeline.get(name, 0) + value
+        for name, value in r.metadata.get("region_cache", {}).items():
+            region_cache[name] = region_cache.get(name, 0) + value
+        blank_pages.extend(r.metadata.get("blank_pages", []))
+        worker_recycles.extend(r.metadata.get("worker_recycles", []))
+        timings.merge(r.metadata.get("timings", {}))
+    
+    if pipeline:
+        metadata["pipeline"] = {k: round(v, 4) if isinstance(v, float) else v for k, v in pipeline.items()}
+    if blank_pages:
+        metadata["blank_pages"] = blank_pages
+    if region_cache:
+        metadata["region_cache"] = region_cache
+    if worker_recycles:
+        metadata["worker_recycles"] = worker_recycles
+    if plan_timings or any("timings" in r.metadata for r in shards):
+        metadata["timings"] = timings.as_dict()
+    timed_out = [r.metadata["timed_out"] for r in shards if "timed_out" in r.metadata]
+    if timed_out:
+        metadata["timed_out"] = timed_out[0]
+    
+    # Each shard's text is in the result or in its shard file
+    texts = (r.text if r.output_file is None else Path(r.output_file).read_text(encoding="utf-8") for r in shards)
+    if output_file is None:
+        text = extractor_cls.page_separator.join(t for t in texts if t)
+        streamed = {}
+    else:
+        counter = write_pages((t for t in texts if t), output_file, extractor_cls.page_separator)
+        for r in shards:
+            if r.output_file is not None:
+                Path(r.output_file).unlink(missing_ok=True)
+        text = ""
+        streamed = {
+            "char_count": counter.char_count,
+            "word_count": counter.word_count,
+            "line_count": counter.line_count,
+            "output_file": str(output_file),
+        }
+    
+    failed = [r for r in shards if not r.success]
+    result = ExtractionResult(
+        extractor_name=extractor_cls.name,
+        text=text,
+        success=not failed,
+        error_message="; ".join(r.error_message or "" for r in failed) or None,
+        execution_time_seconds=sum(r.execution_time_seconds for r in shards),
+        model_load_time_seconds=sum(r.model_load_time_seconds for r in shards),
+        metadata=metadata,
+        **streamed,
+    )
+    if failed and output_file is None:
+        count_text(result)
+    return result
+
+
+def count_text(result: ExtractionResult) -> None:
+    """Fill in the text counts of a result (only successful ones get them on creation)."""
+    result.char_count = len(result.text)
+    result.word_count = len(result.text.split())
+    result.line_count = len(result.text.splitlines())
+
+
+def timed_out_result(
+    outcome: TaskOutcome,
+    budget: float,
+    output_dir: Optional[Path] = None,
+    shard_start: Optional[int] = None,
+) -> ExtractionResult:
+    """
+    Partial result of a task killed at its deadline.
+    
+    The text is that of the pages the killed worker streamed to its
+    temporary output file, or else of the pages a shard without an output
+    file reported.
+    
+    Args:
+        outcome: TaskOutcome of the killed task (its first argument is the PDF)
+        budget: The deadline it overran, in seconds
+        output_dir: Directory the worker streamed to, whose temporary file
+                    of the PDF (or shard) is read and removed
+        shard_start: First page of the shard, if the task was one
+    """
+    extractor = outcome.labels.get("extractor", {"name": "Timeout", "page_separator": "\n"})
+    text = extractor["page_separator"].join(page_text for page_text in outcome.page_texts if page_text)
+    if output_dir is not None and "extractor" in outcome.labels:
+        output_file = text_output_path(output_dir, outcome.args[0], extractor["name"])
+        if shard_start is not None:
+            output_file = shard_output_path(output_file, shard_start)
+        text = take_partial_output(output_file) or text
+    metadata = {"timed_out": outcome.timed_out, "pages_salvaged": outcome.pages}
+    if "pdf_type" in outcome.labels:
+        metadata["pdf_type"] = outcome.labels["pdf_type"]
+    
+    result = ExtractionResult(
+        extractor_name=extractor["name"],
+        text=text,
+        success=False,
+        error_message=f"Timed out after {outcome.seconds:.1f}s ({outcome.timed_out} budget {budget:g}s), "
+                      f"{outcome.pages} page(s) salvaged",
+        execution_time_seconds=outcome.seconds,
+        metadata=metadata,
+    )
+    count_text(result)
+    return result
+
+
+def take_partial_output(output_file: Path) -> str:
+    """
+    Read and delete the temporary file (``write_pages``) a killed worker
+    was streaming ``output_file`` to.
+    
+    Returns:
+        The text written so far ("" if there is no such file)
+    """
+    text = ""
+    # <name>.<pid>.tmp; shard files of the same PDF do not match
+    for tmp_file in output_file.parent.glob(f"{glob.escape(output_file.name)}.[0-9]*.tmp"):
+        try:
+            text = tmp_file.read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            pass
+        tmp_file.unlink(missing_ok=True)
+    return text
+
+
+def run_batch(
+    pdf_files: list[Path],
+    workers: int,
+    extractor_options: Optional[dict[str, dict]] = None,
+    cache: Optional[ExtractionCache] = None,
+    output_dir: Optional[Path] = None,
+    classify_options: Optional[dict] = None,
+    warmup: str = "off",
+    shard_pages: int = 0,
+    group_kb: int = 0,
+    doc_timeout: float = 0,
+    page_timeout: float = 0,
+    max_worker_pages: int = 0,
+    max_worker_rss_mb: float = 0,
+) -> Iterator[tuple[Path, list[ExtractionResult]]]:
+    """
+    Extract PDFs on a pool of worker processes.
+    
+    Each worker keeps its own extractor pool, so models are loaded at most
+    once per worker. PDFs are submitted largest first so that big documents
+    do not end up as stragglers at the end of the run. The worker that
+    classifies a scanned PDF of more than ``shard_pages`` pages returns a
+    ShardPlan instead of extracting it; its page-range shards are queued
+    ahead of the PDFs not started yet, picked up by any worker, and merged
+    back in page order. With ``output_dir``, each shard streams its text to
+    a shard file, and the shard files are concatenated into the PDF's
+    output file, so no shard text passes through this process whole.
+    
+    PDFs smaller than ``group_kb`` KiB are handed to a worker together, up
+    to ``group_kb`` KiB per task (``plan_groups``, by file size); the
+    worker OCRs the scanned ones through one page stream, so layout batches
+    span documents, and returns each PDF's result separately. A group task
+    gets one ``doc_timeout`` per PDF; if it is killed or fails as a whole,
+    its PDFs are queued again one per task, so only the PDF at fault times
+    out or fails.
+    
+    A task (PDF or shard) that overruns ``doc_timeout``, or ``page_timeout``
+    seconds per page once its extractor is ready, has its worker killed and
+    replaced; the pages it completed (streamed to ``output_dir``, or
+    reported by a shard) come back as a partial result flagged
+    ``metadata["timed_out"]``, and the rest of the batch carries on.
+    
+    A worker that has OCR'd ``max_worker_pages`` pages (blank ones too), or
+    grown past ``max_worker_rss_mb`` of resident memory, is recycled after
+    its current task: a fresh worker takes over the queue. The event is recorded in
+    ``metadata["worker_recycles"]`` of the result that triggered it.
+    
+    Args:
+        pdf_files: PDFs to process
+        workers: Number of worker processes
+        extractor_options: Constructor options per extractor class
+        cache: Optional extraction cache shared by the workers
+        output_dir: Optional directory the workers stream extracted text to
+        classify_options: Optional keyword arguments of analyze_pdf
+        warmup: --warmup mode of the workers: "always" starts loading the
+                OCR models on a background thread of every worker as soon as
+                it starts, "auto" once the worker classifies its first
+                scanned or mixed PDF, "off" not ahead of first use
+        shard_pages: Pages per shard of large scanned PDFs (0: no sharding)
+        group_kb: KiB per task of grouped small PDFs (0: no grouping)
+        doc_timeout: Budget of one task in seconds (0: none)
+        page_timeout: Budget of one page in seconds, n times that for a
+                      layout batch of n pages (0: none)
+        max_worker_pages: OCR'd pages after which a worker is recycled (0: never)
+        max_worker_rss_mb: Resident memory in MiB above which a worker is
+                           recycled (0: never; needs psutil)
+        
+    Yields:
+        (pdf_path, results) tuples in completion order
+    """
+    schedule = sorted(pdf_files, key=lambda p: p.stat().st_size, reverse=True)
+    
+    with WorkerPool(
+        workers,
+        initializer=_init_worker,
+        initargs=(extractor_options or {}, cache, output_dir, timing.is_enabled(), classify_options or {}, warmup),
+        task_timeout=doc_timeout,
+        page_timeout=page_timeout,
+        max_pages=max_worker_pages,
+        max_rss_mb=max_worker_rss_mb,
+    ) as executor:
+        # Options only; the parent never builds an extractor
+        pool = ExtractorPool(extractor_options)
+        tasks = {}  # task id -> (pdf_path, shard index or None)
+        groups = {}  # task id -> PDFs of a group task
+        shards = {}  # pdf_path -> {"plan", "results", "left", "recycles"}
+        recycles = {}  # pdf_path -> recycle events of a failed group, reported with the PDF
+        for group in plan_groups(schedule, group_kb * 1024) if group_kb > 0 else [[p] for p in schedule]:
+            if len(group) > 1:
+                groups[executor.submit(_extract_group_in_worker, group, shard_pages, budgets=len(group))] = group
+            else:
+                tasks[executor.submit(_extract_in_worker, group[0], shard_pages)] = (group[0], None)
+        
+        def start_shards(pdf_path: Path, plan: ShardPlan, events: list) -> None:
+            shards[pdf_path] = {
+                "plan": plan,
+                "results": [None] * len(plan.ranges),
+                "left": len(plan.ranges),
+                "recycles": events,
+            }
+            # Reversed, as each one goes to the front of the queue
+            for i, (start, stop) in reversed(list(enumerate(plan.ranges))):
+                tasks[executor.submit(_extract_shard_in_worker, pdf_path, start, stop, first=True)] = (pdf_path, i)
+        
+        for outcome in executor.results():
+            if outcome.task_id in groups:
+                group = groups.pop(outcome.task_id)
+                if outcome.finished:
+                    events = [outcome.recycled] if outcome.recycled is not None else []
+                    for pdf_path, results in outcome.result:
+                        if isinstance(results, ShardPlan):
+                            start_shards(pdf_path, results, events)
+                        else:
+                            if events:
+                                results[0].metadata["worker_recycles"] = events
+                            yield pdf_path, results
+                        events = []
+                    continue
+                
+                # Retry each PDF on its own, dropping what the group wrote
+                if outcome.recycled is not None:
+                    recycles[group[0]] = [outcome.recycled]
+                for pdf_path in reversed(group):
+                    if output_dir is not None:
+                        take_partial_output(text_output_path(output_dir, pdf_path, get_extractor_class(GROUP_EXTRACTOR).name))
+                    tasks[executor.submit(_extract_in_worker, pdf_path, shard_pages, first=True)] = (pdf_path, None)
+                continue
+            
+            pdf_path, shard = tasks.pop(outcome.task_id)
+            if outcome.finished and isinstance(outcome.result, ShardPlan):
+                events = recycles.pop(pdf_path, []) + ([outcome.recycled] if outcome.recycled is not None else [])
+                start_shards(pdf_path, outcome.result, events)
+                continue
+            
+            if outcome.finished:
+                results = outcome.result
+            elif outcome.timed_out:
+                budget = doc_timeout if outcome.timed_out == "document" else page_timeout
+                shard_start = shards[pdf_path]["plan"].ranges[shard][0] if shard is not None else None
+                results = [timed_out_result(outcome, budget, output_dir, shard_start)]
+            else:
+                # Task raised outside the extractors, or the worker died
+                # (e.g. crashed inside a native library)
+                results = [ExtractionResult(
+                    extractor_name="WorkerError",
+                    text="",
+                    success=False,
+                    error_message=outcome.error,
+                )]
+            events = recycles.pop(pdf_path, []) if shard is None else []
+            if outcome.recycled is not None:
+                events.append(outcome.recycled)
+            if events:
+                results[0].metadata["worker_recycles"] = events
+            
+            if shard is None:
+                yield pdf_path, results
+                continue
+            
+            state = shards[pdf_path]
+            state["results"][shard] = results[0]
+            state["left"] -= 1
+            if state["left"]:
+                continue
+            
+            del shards[pdf_path]
+            plan = state["plan"]
+            output_file = None
+            if output_dir is not None:
+                output_file = text_output_path(output_dir, pdf_path, get_extractor_class(SHARD_EXTRACTOR).name)
+            result = merge_shard_results(state["results"], shard_pages, plan.timings, output_file)
+            if state["recycles"]:
+                result.metadata["worker_recycles"] = state["recycles"] + result.metadata.get("worker_recycles", [])
+            if cache is not None:
+                result.metadata["cache"] = "miss"
+                if result.success:
+                    key = cache_key(plan.content_hash, result.extractor_name, pool.cache_config(SHARD_EXTRACTOR))
+                    cache.put(key, cache_entry(result), text_file=result.output_file)
+            result.metadata["pdf_type"] = plan.pdf_type
+            if plan.classification is not None:
+                result.metadata["classification"] = plan.classification
+            result.content_hash = plan.content_hash
+            yield pdf_path, [result]
+
+
 def generate_comparison_table(results: list[ExtractionResult]) -> str:
     """Generate a markdown comparison table."""
     lines = [
-        "| Extractor | Success | Time (s) | Words | Chars | Lines |",
-        "|-----------|---------|----------|-------|-------|-------|",
+        "| Extractor | Success | Time (s) | Load (s) | Words | Chars | Lines |",
+        "|-----------|---------|----------|----------|-------|-------|-------|",
     ]
     
     for r in results:
         status = "✓" if r.success else "✗"
         lines.append(
             f"| {r.extractor_name} | {status} | {r.execution_time_seconds:.2f} | "
+            f"{r.model_load_time_seconds:.2f} | "
             f"{r.word_count} | {r.char_count} | {r.line_count} |"
         )
     
@@ -118,113 +1030,170 @@ def save_results(
     output_dir.mkdir(parents=True, exist_ok=True)
     pdf_name = pdf_path.stem
     
-    # Save each extractor's output to a separate file
-    for result in results:
-        if result.success:
-            output_file = output_dir / f"{pdf_name}_{result.extractor_name}.txt"
-            output_file.write_text(result.text, encoding="utf-8")
-    
-    # Save comparison summary
-    summary = {
-        "pdf_file": str(pdf_path),
-        "timestamp": datetime.now().isoformat(),
-        "results": [
-            {
-                "extractor": r.extractor_name,
-                "success": r.success,
-                "error": r.error_message,
-                "execution_time_seconds": r.execution_time_seconds,
-                "char_count": r.char_count,
-                "word_count": r.word_count,
-                "line_count": r.line_count,
-            }
-            for r in results
-        ],
-    }
+    with timing.span("save"):
+        # Save each extractor's output to a separate file (unless it was
+        # already streamed there during extraction)
+        for result in results:
+            # Partial text of a timed-out extraction is kept too
+            if (result.success or "timed_out" in result.metadata) and result.output_file is None:
+                output_file = text_output_path(output_dir, pdf_path, result.extractor_name)
+                output_file.write_text(result.text, encoding="utf-8")
+        
+        # Save comparison summary
+        summary = {
+            "pdf_file": str(pdf_path),
+            "timestamp": datetime.now().isoformat(),
+            "results": [r.to_summary() for r in results],
+        }
+        
+        summary_file = output_dir / f"{pdf_name}_summary.json"
+        summary_file.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+
+
+def generate_cache_summary(aggregator: ReportAggregator) -> list[str]:
+    """Report lines with extraction-cache hit/miss counts (empty if unused)."""
+    counts = aggregator.cache_counts
+    if not any(hits or misses for hits, misses in counts.values()):
+        return []
     
-    summary_file = output_dir / f"{pdf_name}_summary.json"
-    summary_file.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    lines = [
+        "## Extraction Cache",
+        "",
+        "| Level | Hits | Misses | Hit Rate |",
+        "|-------|------|--------|----------|",
+    ]
+    for level, (hits, misses) in counts.items():
+        if hits or misses:
+            lines.append(f"| {level} | {hits} | {misses} | {hits / (hits + misses) * 100:.0f}% |")
+    lines.append("")
+    return lines
 
 
-def generate_report(
-    all_results: dict[str, list[ExtractionResult]],
-    output_dir: Optional[Path] = None,
-) -> str:
+def generate_blank_page_summary(aggregator: ReportAggregator) -> list[str]:
+    """Report lines on OCR pages skipped as blank (empty if none were)."""
+    if not aggregator.blank_pages:
+        return []
+    return [
+        "## Blank Pages",
+        "",
+        f"{aggregator.blank_pages} page(s) skipped as blank before layout detection, "
+        f"saving an estimated {aggregator.blank_seconds_saved:.1f} s of rendering and inference",
+        "",
+    ]
+
+
+def generate_recycle_summary(aggregator: ReportAggregator) -> list[str]:
+    """Report lines on batch workers recycled by --max-worker-pages/--max-worker-rss (empty if none were)."""
+    if not aggregator.worker_recycles:
+        return []
+    reasons = ", ".join(f"{count} by {reason}" for reason, count in sorted(aggregator.worker_recycles.items()))
+    lines = [
+        "## Worker Recycling",
+        "",
+        f"{sum(aggregator.worker_recycles.values())} worker(s) recycled ({reasons})",
+    ]
+    if aggregator.recycle_peak_rss_mb:
+        lines.append(f"Peak worker memory at recycling: {aggregator.recycle_peak_rss_mb:.0f} MiB")
+    lines.append("")
+    return lines
+
+
+def generate_pdf_section(pdf_path: Path, results: list[ExtractionResult]) -> str:
+    """Report section of one PDF."""
+    return "\n".join([
+        f"## {Path(pdf_path).name}",
+        "",
+        generate_comparison_table(results),
+        "",
+        "",
+    ])
+
+
+def generate_report(aggregator: ReportAggregator, out: TextIO) -> None:
     """
-    Generate a comprehensive comparison report.
+    Write a comprehensive comparison report.
+    
+    The per-PDF sections are streamed from the aggregator's spool file, so
+    the report is never held in memory as a whole.
     
     Args:
-        all_results: Dict mapping PDF paths to their extraction results
-        output_dir: Optional directory to save the report
-        
-    Returns:
-        Report as markdown string
+        aggregator: Statistics of all extraction results
+        out: Text stream to write the markdown report to
     """
-    lines = [
+    out.write("\n".join([
         "# PDF Text Extraction Comparison Report",
         "",
         f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
         "",
-        f"Total PDFs tested: {len(all_results)}",
+        f"Total PDFs tested: {aggregator.pdf_count}",
         "",
-    ]
+        "",
+    ]))
     
     # Per-PDF results
-    for pdf_path, results in all_results.items():
-        lines.extend([
-            f"## {Path(pdf_path).name}",
-            "",
-            generate_comparison_table(results),
-            "",
-        ])
+    for section in aggregator.iter_sections():
+        out.write(section)
     
     # Overall summary
-    lines.extend([
+    lines = [
         "## Overall Summary",
         "",
-    ])
-    
-    # Aggregate statistics by extractor
-    extractor_stats: dict[str, dict] = {}
-    for results in all_results.values():
-        for r in results:
-            if r.extractor_name not in extractor_stats:
-                extractor_stats[r.extractor_name] = {
-                    "success_count": 0,
-                    "total_count": 0,
-                    "total_time": 0.0,
-                    "total_words": 0,
-                }
-            
-            stats = extractor_stats[r.extractor_name]
-            stats["total_count"] += 1
-            if r.success:
-                stats["success_count"] += 1
-                stats["total_time"] += r.execution_time_seconds
-                stats["total_words"] += r.word_count
-    
-    lines.extend([
-        "| Extractor | Success Rate | Avg Time (s) | Avg Words |",
-        "|-----------|--------------|--------------|-----------|",
-    ])
+        "| Extractor | Success Rate | Avg Time (s) | P50 (s) | P95 (s) | Model Load (s) | Avg Words |",
+        "|-----------|--------------|--------------|---------|---------|----------------|-----------|",
+    ]
     
-    for name, stats in extractor_stats.items():
-        success_rate = stats["success_count"] / stats["total_count"] * 100
-        avg_time = stats["total_time"] / max(stats["success_count"], 1)
-        avg_words = stats["total_words"] / max(stats["success_count"], 1)
+    for name, stats in aggregator.extractors.items():
+        success_rate = stats.success_count / stats.total_count * 100
+        avg_time = stats.total_time / max(stats.success_count, 1)
+        avg_words = stats.total_words / max(stats.success_count, 1)
         lines.append(
-            f"| {name} | {success_rate:.0f}% | {avg_time:.2f} | {avg_words:.0f} |"
+            f"| {name} | {success_rate:.0f}% | {avg_time:.2f} | "
+            f"{stats.times.quantile(0.5):.2f} | {stats.times.quantile(0.95):.2f} | "
+            f"{stats.total_load_time:.2f} | {avg_words:.0f} |"
         )
     
     lines.append("")
+    lines.extend(generate_cache_summary(aggregator))
+    lines.extend(generate_blank_page_summary(aggregator))
+    lines.extend(generate_recycle_summary(aggregator))
+    out.write("\n".join(lines))
+
+
+def write_report(aggregator: ReportAggregator, output_dir: Path) -> Path:
+    """Write comparison_report.md into ``output_dir`` and return its path."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    report_file = output_dir / "comparison_report.md"
+    with open(report_file, "w", encoding="utf-8") as f:
+        generate_report(aggregator, f)
+    return report_file
+
+
+def report_from_manifest(output_dir: Path) -> Path:
+    """
+    Rebuild comparison_report.md from the manifest alone.
     
-    report = "\n".join(lines)
-    
-    if output_dir:
-        report_file = output_dir / "comparison_report.md"
-        report_file.write_text(report, encoding="utf-8")
-    
-    return report
+    Args:
+        output_dir: Output directory holding manifest.jsonl
+        
+    Returns:
+        Path of the written report
+    """
+    entries = load_manifest(output_dir / MANIFEST_NAME)
+    aggregator = ReportAggregator()
+    try:
+        for pdf_file in sorted(entries):
+            results = [ExtractionResult.from_summary(r) for r in entries[pdf_file]["results"]]
+            aggregator.add(results, generate_pdf_section(pdf_file, results))
+        return write_report(aggregator, output_dir)
+    finally:
+        aggregator.close()
+
+
+def print_report(report_file: Path) -> None:
+    """Copy a written report to stdout without loading it whole."""
+    with open(report_file, encoding="utf-8") as f:
+        shutil.copyfileobj(f, sys.stdout)
+    print()
 
 
 def main():
@@ -234,6 +1203,7 @@ def main():
     parser.add_argument(
         "input",
         type=Path,
+        nargs="?",
         help="PDF file or directory containing PDFs",
     )
     parser.add_argument(
@@ -247,14 +1217,171 @@ def main():
         action="store_true",
         help="Suppress progress output",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes (default: 1, sequential)",
+    )
+    parser.add_argument(
+        "--warmup",
+        choices=["auto", "always", "off"],
+        default="auto",
+        help="Load the OCR models on a background thread: 'auto' starts when "
+             "the first scanned or mixed PDF is classified (in each worker with "
+             "--workers) and lets text-only PDFs go ahead while they load, 'always' "
+             "at startup (also in every worker), 'off' loads them on first use (default: auto)",
+    )
+    parser.add_argument(
+        "--shard-pages",
+        type=int,
+        default=250,
+        help="With --workers, OCR scanned PDFs of more pages than this in "
+             "page-range shards spread over the workers (0 disables, default: 250)",
+    )
+    parser.add_argument(
+        "--group-kb",
+        type=int,
+        default=4096,
+        metavar="KB",
+        help="With --workers, hand PDFs smaller than this many KiB to a worker together, "
+             "up to this many KiB per task, so small scanned PDFs share layout batches "
+             "(0 disables, default: 4096)",
+    )
+    parser.add_argument(
+        "--doc-timeout",
+        type=float,
+        default=0,
+        help="Seconds one PDF (or shard) may take before its worker is killed "
+             "and the pages done so far are saved as a partial result (0 disables, default: 0)",
+    )
+    parser.add_argument(
+        "--page-timeout",
+        type=float,
+        default=0,
+        help="Seconds per page a worker may take once its extractor is ready "
+             "before it is killed like with --doc-timeout; a layout batch of N pages "
+             "gets N times that (0 disables, default: 0)",
+    )
+    parser.add_argument(
+        "--max-worker-pages",
+        type=int,
+        default=0,
+        help="Replace a worker with a fresh one after it has OCR'd this "
+             "many pages, blank ones included, once its current PDF (or shard) is done (0 disables, default: 0)",
+    )
+    parser.add_argument(
+        "--max-worker-rss",
+        type=float,
+        default=0,
+        metavar="MB",
+        help="Replace a worker with a fresh one when its resident memory exceeds "
+             "this many MiB after a PDF (or shard); needs psutil (0 disables, default: 0)",
+    )
+    parser.add_argument(
+        "--ocr-batch-size",
+        type=int,
+        default=16,
+        help="Region crops built and held at a time, per PaddleOCR predict call; "
+             "also its text-recognition batch size (default: 16)",
+    )
+    parser.add_argument(
+        "--layout-batch-size",
+        type=int,
+        default=4,
+        help="Rendered pages per layout-detection predict call (default: 4)",
+    )
+    parser.add_argument(
+        "--prefetch-pages",
+        type=int,
+        default=2,
+        help="Pages pre-rendered ahead of OCR inference; 0 renders inline (default: 2)",
+    )
+    parser.add_argument(
+        "--layout-dpi",
+        type=int,
+        default=150,
+        help="DPI of the layout-detection render; text regions are re-rendered "
+             "at full DPI (0 renders whole pages at full DPI, default: 150)",
+    )
+    parser.add_argument(
+        "--no-text-layer-reuse",
+        action="store_true",
+        help="OCR every layout region of scanned pages, even where the PDF "
+             "text layer inside it reads well",
+    )
+    parser.add_argument(
+        "--no-blank-skip",
+        action="store_true",
+        help="Run layout detection on every OCR page, even ones without text layer "
+             "and without ink (no pixel more than 64 gray levels darker or lighter "
+             "than the paper in a low-DPI render)",
+    )
+    parser.add_argument(
+        "--region-cache",
+        choices=["exact", "perceptual", "off"],
+        default="exact",
+        help="OCR repeated regions (headers, footers, stamps) once, matched by "
+             "identical pixels or a perceptual hash plus position (default: exact)",
+    )
+    parser.add_argument(
+        "--region-cache-store",
+        action="store_true",
+        help="With --cache-dir, also store every OCR'd region there, so repeated "
+             "regions are recognized once across documents, workers and runs",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="Reuse extraction results keyed by PDF content from this directory",
+    )
+    parser.add_argument(
+        "--cache-size-mb",
+        type=int,
+        default=1024,
+        help="Size cap of the extraction cache, least recently used entries "
+             "are evicted first (default: 1024)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip PDFs recorded as finished (and unchanged) in the output "
+             "directory's manifest.jsonl",
+    )
+    parser.add_argument(
+        "--rebuild-report",
+        action="store_true",
+        help="Only regenerate comparison_report.md from the manifest",
+    )
+    parser.add_argument(
+        "--sample-classify",
+        action="store_true",
+        help="Classify from a spread sample of pages, stopping as soon as the "
+             "verdict is statistically settled (full scan only when ambiguous)",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Record per-stage timing spans into each result's metadata and "
+             "write run totals to timings.json",
+    )
     
     args = parser.parse_args()
     
+    if args.rebuild_report:
+        report_file = report_from_manifest(args.output_dir)
+        if not args.quiet:
+            print_report(report_file)
+        return
+    
     # Find PDF files
-    if args.input.is_file():
+    if args.input is None:
+        parser.error("input is required unless --rebuild-report is given")
+    elif args.input.is_file():
         pdf_files = [args.input]
     elif args.input.is_dir():
-        pdf_files = list(args.input.glob("*.pdf"))
+        pdf_files = sorted(args.input.glob("*.pdf"))
     else:
         print(f"Error: {args.input} is not a valid file or directory")
         sys.exit(1)
@@ -270,28 +1397,161 @@ def main():
         print(f"Output directory: {args.output_dir}")
         print()
     
-    # Run extractions
-    all_results: dict[str, list[ExtractionResult]] = {}
+    extractor_options = {
+        "OCRExtractor": {
+            "ocr_batch_size": args.ocr_batch_size,
+            "layout_batch_size": args.layout_batch_size,
+            "prefetch_pages": args.prefetch_pages,
+            "layout_dpi": args.layout_dpi or None,
+            "reuse_text_layer": not args.no_text_layer_reuse,
+            "skip_blank_pages": not args.no_blank_skip,
+            "region_cache": None if args.region_cache == "off" else args.region_cache,
+        },
+    }
+    
+    classify_options = {"sample": True} if args.sample_classify else {}
     
+    cache = None
+    if args.cache_dir is not None:
+        cache = ExtractionCache(args.cache_dir, max_bytes=args.cache_size_mb * 1024 * 1024)
+        # Hybrid PDFs are cached per OCR'd page
+        extractor_options["HybridExtractor"] = {"page_cache": cache}
+        if args.region_cache_store:
+            extractor_options["OCRExtractor"]["region_store"] = cache
+    elif args.region_cache_store:
+        print("Warning: --region-cache-store needs --cache-dir; ignoring it", file=sys.stderr)
+    
+    # Per-stage timings of the whole run: per-document spans are merged in,
+    # spans of this process (saving, reporting) are recorded directly
+    timing.enable(args.timings)
+    run_timings = timing.StageTimings() if args.timings else None
+    
+    # Every finished PDF is appended to the manifest so a crashed run can resume
+    manifest = Manifest(args.output_dir / MANIFEST_NAME, resume=args.resume)
+    # Results are reduced to report statistics as they finish; texts are
+    # only written to disk, never kept for the whole run
+    aggregator = ReportAggregator()
+    order = {str(p): i for i, p in enumerate(pdf_files)}
+    
+    pending = []
     for pdf_file in pdf_files:
+        if args.resume and manifest.is_complete(pdf_file):
+            entry = manifest.entries[str(pdf_file)]
+            results = [ExtractionResult.from_summary(r) for r in entry["results"]]
+            aggregator.add(results, generate_pdf_section(pdf_file, results), order[str(pdf_file)])
+        else:
+            pending.append(pdf_file)
+    
+    if verbose and args.resume:
+        print(f"Resuming: {len(pdf_files) - len(pending)} PDF(s) already done, {len(pending)} to go")
+        print()
+    
+    def finish(pdf_file: Path, results: list[ExtractionResult]) -> None:
+        if run_timings is not None:
+            run_timings.merge(results[0].metadata.get("timings", {}))
+        with timing.recording(run_timings):
+            save_results(pdf_file, results, args.output_dir)
+            with timing.span("manifest"):
+                # Reuse the hash of the cache key instead of hashing the file again
+                manifest.record(pdf_file, results, results[0].content_hash)
+            aggregator.add(results, generate_pdf_section(pdf_file, results), order[str(pdf_file)])
+    
+    # Run extractions, reusing each extractor (and its models) across PDFs
+    if args.max_worker_rss > 0 and rss_mb() is None:
+        print("Warning: --max-worker-rss needs psutil, which is not installed; ignoring it", file=sys.stderr)
+    
+    # Deadlines and recycling need a supervised worker, even for a single one
+    supervised = args.doc_timeout > 0 or args.page_timeout > 0 or args.max_worker_pages > 0 or args.max_worker_rss > 0
+    if args.workers > 1 or supervised:
+        batch = run_batch(pending, args.workers, extractor_options, cache, args.output_dir, classify_options,
+                          warmup=args.warmup, shard_pages=args.shard_pages,
+                          group_kb=args.group_kb,
+                          doc_timeout=args.doc_timeout, page_timeout=args.page_timeout,
+                          max_worker_pages=args.max_worker_pages, max_worker_rss_mb=args.max_worker_rss)
+        for done, (pdf_file, results) in enumerate(batch, start=1):
+            finish(pdf_file, results)
+            
+            if verbose:
+                r = results[0]
+                pdf_type = r.metadata.get("pdf_type", "?")
+                print(f"[{done}/{len(pending)}] {pdf_file.name}: {pdf_type} → "
+                      f"{r.extractor_name} {format_status(r)}")
+                for event in r.metadata.get("worker_recycles", []):
+                    rss = "" if event["rss_mb"] is None else f", {event['rss_mb']:.0f} MiB"
+                    print(f"    worker {event['pid']} recycled ({event['reason']}: {event['pages']} pages{rss})")
+        
         if verbose:
-            print(f"Processing: {pdf_file.name}")
+            print()
+    else:
+        pool = init_default_pool(extractor_options)
+        if args.warmup == "always":
+            pool.warm_up(WARM_UP_EXTRACTOR)
         
-        results = run_extraction(pdf_file, verbose=verbose)
-        all_results[str(pdf_file)] = results
+        def extract(pdf_file: Path, classified: Optional[tuple] = None, doc_timings=None) -> None:
+            if verbose:
+                print(f"Processing: {pdf_file.name}")
+            
+            results = run_extraction(
+                pdf_file,
+                verbose=verbose,
+                pool=pool,
+                cache=cache,
+                output_dir=args.output_dir,
+                classify_options=classify_options,
+                classified=classified,
+                timings=doc_timings,
+            )
+            
+            # Save individual results
+            finish(pdf_file, results)
+            
+            if verbose:
+                print()
         
-        # Save individual results
-        save_results(pdf_file, results, args.output_dir)
+        # With --warmup auto, PDFs that need the OCR models wait (already
+        # classified) while the models load and the text-only PDFs go ahead
+        deferred = []
+        for pdf_file in pending:
+            if args.warmup == "off" or pool.is_ready(WARM_UP_EXTRACTOR):
+                extract(pdf_file)
+            else:
+                with timing.recording() as doc_timings:
+                    try:
+                        classified = classify_document(pdf_file, cache, classify_options)
+                    except Exception:
+                        classified = None  # run_extraction reports the error
+                
+                if classified is not None and classified[0] in NEEDS_WARM_UP:
+                    pool.warm_up(WARM_UP_EXTRACTOR)
+                    deferred.append((pdf_file, classified, doc_timings))
+                    if verbose:
+                        print(f"Deferred: {pdf_file.name} ({classified[0]}) until the OCR models are loaded")
+                        print()
+                else:
+                    extract(pdf_file, classified, doc_timings)
+            
+            if deferred and pool.is_ready(WARM_UP_EXTRACTOR):
+                for item in deferred:
+                    extract(*item)
+                deferred.clear()
         
-        if verbose:
-            print()
+        for item in deferred:
+            extract(*item)
+    
+    manifest.close()
+    
+    # Generate and print report (sections in input order)
+    with timing.recording(run_timings), timing.span("report"):
+        report_file = write_report(aggregator, args.output_dir)
+    aggregator.close()
     
-    # Generate and print report
-    report = generate_report(all_results, args.output_dir)
+    if run_timings is not None:
+        timings_file = args.output_dir / "timings.json"
+        timings_file.write_text(json.dumps(run_timings.as_dict(), indent=2), encoding="utf-8")
     
     if verbose:
         print("=" * 60)
-        print(report)
+        print_report(report_file)
         print("=" * 60)
         print(f"\nResults saved to: {args.output_dir}")
 
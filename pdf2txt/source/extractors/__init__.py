@@ -1,25 +1,36 @@
-"""PDF text extraction modules."""
+"""
+PDF text extraction modules.
 
-from .base import BaseExtractor, ExtractionResult
-from .pymupdf_extractor import PyMuPDFExtractor
-# from .pdfminer_extractor import PDFMinerExtractor
-# from .pdfplumber_extractor import PDFPlumberExtractor
-# from .pypdf_extractor import PyPDFExtractor
-from .ocr_extractor import OCRExtractor
-# from .pytesseract_extractor import PyTesseractExtractor
-# from .marker_extractor import MarkerExtractor
-# from .docling_extractor import DoclingExtractor
+The extractor classes are resolved lazily through ``registry.EXTRACTORS``:
+``from extractors import OCRExtractor`` imports the OCR module only at that
+point (PEP 562 module ``__getattr__``).
+"""
+
+from .base import BaseExtractor, ExtractionResult, write_pages
+from .pool import ExtractorPool, default_pool, init_default_pool
+from .registry import EXTRACTORS, get_extractor_class
 
 __all__ = [
     "BaseExtractor",
     "ExtractionResult",
+    "ExtractorPool",
+    "HybridExtractor",
     "OCRExtractor",
     "PyMuPDFExtractor",
-    # "PDFMinerExtractor",
-    # "PDFPlumberExtractor",
-    # "PyPDFExtractor",
-#    "PyTesseractExtractor",
-#    "MarkerExtractor",
-#    "DoclingExtractor",
+    "default_pool",
+    "get_extractor_class",
+    "init_default_pool",
+    "write_pages",
 ]
 
+
+def __getattr__(name: str):
+    if name in EXTRACTORS:
+        cls = get_extractor_class(name)
+        globals()[name] = cls  # later lookups skip __getattr__
+        return cls
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(EXTRACTORS))
@@ -2,10 +2,114 @@
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
+import inspect
+import os
 from pathlib import Path
 import time
 import traceback
-from typing import Optional
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from utils.timing import span
+
+# Characters str.splitlines() treats as line boundaries ("\r\n" counts once)
+LINE_BREAKS = "\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029"
+
+# Called as progress(kind, payload) while an extraction runs: "extractor"
+# (a dict of the extractor's name and page_separator, at the start),
+# "pages" (the next ``payload`` pages are under way as one step), "page"
+# (a page finished) and "ocr" (``payload`` more pages went through OCR,
+# blank ones included). Batch workers enforce their page deadlines with it
+# (utils.worker_pool.report_progress), so it must be cheap.
+ProgressCallback = Callable[[str, Any], None]
+
+
+def no_progress(kind: str, payload: Any = None) -> None:
+    """ProgressCallback that ignores the progress."""
+
+
+class TextCounter:
+    """
+    Char/word/line counts of a text fed in chunks.
+    
+    The counts equal ``len(text)``, ``len(text.split())`` and
+    ``len(text.splitlines())`` of the concatenated chunks, without building
+    the concatenation or its word and line lists.
+    """
+    
+    def __init__(self):
+        self.char_count = 0
+        self.word_count = 0
+        self._breaks = 0
+        self._in_word = False  # last chunk ended inside a word
+        self._last_char = ""
+    
+    def feed(self, chunk: str) -> None:
+        if not chunk:
+            return
+        
+        self.char_count += len(chunk)
+        
+        self.word_count += len(chunk.split())
+        if self._in_word and not chunk[0].isspace():
+            self.word_count -= 1  # word continues across the chunk boundary
+        self._in_word = not chunk[-1].isspace()
+        
+        for piece in chunk.splitlines(keepends=True):
+            if piece[-1] in LINE_BREAKS:
+                self._breaks += 1
+        if self._last_char == "\r" and chunk[0] == "\n":
+            self._breaks -= 1  # "\r\n" split across the chunk boundary
+        self._last_char = chunk[-1]
+    
+    @property
+    def line_count(self) -> int:
+        trailing = 1 if self._last_char and self._last_char not in LINE_BREAKS else 0
+        return self._breaks + trailing
+
+
+def write_pages(pages: Iterable[str], output_file: Path, separator: str = "\n") -> TextCounter:
+    """
+    Stream page texts to a file, joined by ``separator``, while counting them.
+    
+    The text is written to a temporary file that replaces ``output_file``
+    only once all pages are written, so a failed extraction leaves no
+    partial output behind. Each page is flushed as it is written; a worker
+    killed at its deadline leaves the finished pages in the temporary file.
+    
+    Args:
+        pages: Page texts
+        output_file: File to write
+        separator: String written between consecutive pages
+        
+    Returns:
+        TextCounter of the written text
+    """
+    counter = TextCounter()
+    tmp_file = output_file.with_name(f"{output_file.name}.{os.getpid()}.tmp")
+    
+    try:
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            for i, page_text in enumerate(pages):
+                with span("write", i):
+                    if i:
+                        f.write(separator)
+                        counter.feed(separator)
+                    f.write(page_text)
+                    counter.feed(page_text)
+                    f.flush()  # finished pages survive a killed worker
+        os.replace(tmp_file, output_file)
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
+    
+    return counter
+
+
+def _reported_pages(pages: Iterable[str], progress: ProgressCallback) -> Iterator[str]:
+    """Pass page texts through, reporting each one as finished once it was consumed."""
+    for page_text in pages:
+        yield page_text
+        progress("page", None)
 
 
 @dataclass
@@ -17,16 +121,51 @@ class ExtractionResult:
     success: bool
     error_message: Optional[str] = None
     execution_time_seconds: float = 0.0
+    model_load_time_seconds: float = 0.0
     char_count: int = 0
     word_count: int = 0
     line_count: int = 0
     metadata: dict = field(default_factory=dict)
+    # Set when the text was streamed to this file instead of kept in ``text``
+    output_file: Optional[str] = None
+    # sha256 of the PDF if it was already computed (e.g. for the cache key)
+    content_hash: Optional[str] = None
     
     def __post_init__(self):
         if self.success and self.text:
             self.char_count = len(self.text)
             self.word_count = len(self.text.split())
             self.line_count = len(self.text.splitlines())
+    
+    def to_summary(self) -> dict:
+        """Statistics of this result without the text (as in the summary JSON)."""
+        return {
+            "extractor": self.extractor_name,
+            "success": self.success,
+            "error": self.error_message,
+            "execution_time_seconds": self.execution_time_seconds,
+            "model_load_time_seconds": self.model_load_time_seconds,
+            "char_count": self.char_count,
+            "word_count": self.word_count,
+            "line_count": self.line_count,
+            "metadata": self.metadata,
+        }
+    
+    @classmethod
+    def from_summary(cls, summary: dict) -> "ExtractionResult":
+        """Rebuild a text-less result from ``to_summary()`` output."""
+        return cls(
+            extractor_name=summary["extractor"],
+            text="",
+            success=summary["success"],
+            error_message=summary.get("error"),
+            execution_time_seconds=summary.get("execution_time_seconds", 0.0),
+            model_load_time_seconds=summary.get("model_load_time_seconds", 0.0),
+            char_count=summary.get("char_count", 0),
+            word_count=summary.get("word_count", 0),
+            line_count=summary.get("line_count", 0),
+            metadata=summary.get("metadata", {}),
+        )
 
 
 class BaseExtractor(ABC):
@@ -35,6 +174,33 @@ class BaseExtractor(ABC):
     name: str = "BaseExtractor"
     description: str = "Base extractor class"
     supports_ocr: bool = False
+    # Constructor options that change the extracted text (see cache_config)
+    output_options: tuple = ()
+    # Bump when the extraction logic changes in a way that alters its output
+    cache_version: int = 1
+    # Joins the texts yielded by extract_pages into the extracted text
+    page_separator: str = "\n"
+    
+    @classmethod
+    def cache_config(cls, **options) -> dict:
+        """
+        Settings that determine this extractor's output, for cache keys.
+        
+        Args:
+            **options: Constructor keyword arguments the extractor is built with
+            
+        Returns:
+            Dict of ``cache_version`` and every ``output_options`` entry,
+            taken from ``options`` or else the constructor default
+        """
+        params = inspect.signature(cls.__init__).parameters
+        config = {"cache_version": cls.cache_version}
+        for name in cls.output_options:
+            if name in options:
+                config[name] = options[name]
+            elif name in params:
+                config[name] = params[name].default
+        return config
     
     @abstractmethod
     def extract(self, pdf_path: Path) -> str:
@@ -49,20 +215,102 @@ class BaseExtractor(ABC):
         """
         pass
     
-    def extract_with_timing(self, pdf_path: Path) -> ExtractionResult:
+    def extract_with_metadata(self, pdf_path: Path, analysis=None) -> tuple[str, dict]:
+        """
+        Extract text together with extractor-specific metadata.
+        
+        Extractors that record per-document details (e.g. per-page routing)
+        or can reuse the classification pass override this; the default
+        has no metadata and ignores ``analysis``.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            analysis: Optional PdfAnalysis from utils.classify_pdf.analyze_pdf
+                      holding the already parsed pages of this PDF
+            
+        Returns:
+            Tuple of (extracted text, metadata dict)
+        """
+        return self.extract(pdf_path), {}
+    
+    def extract_pages(
+        self,
+        pdf_path: Path,
+        analysis=None,
+        metadata: Optional[dict] = None,
+        progress: ProgressCallback = no_progress,
+    ) -> Iterator[str]:
+        """
+        Yield the extracted text page by page.
+        
+        Joined with ``page_separator`` the yielded texts equal the text of
+        ``extract_with_metadata``. Extractors that can produce pages one at
+        a time override this; the default yields the whole text at once.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            analysis: Optional PdfAnalysis of the PDF (see extract_with_metadata)
+            metadata: Optional dict updated with the extractor metadata once
+                      the generator is exhausted
+            progress: Callback told about the steps inside a page or spanning
+                      several pages ("pages"); finished pages are reported by
+                      the caller
+            
+        Yields:
+            Page texts in page order
+        """
+        text, extra = self.extract_with_metadata(pdf_path, analysis)
+        if metadata is not None:
+            metadata.update(extra)
+        yield text
+    
+    def extract_with_timing(
+        self,
+        pdf_path: Path,
+        analysis=None,
+        output_file: Optional[Path] = None,
+        progress: ProgressCallback = no_progress,
+    ) -> ExtractionResult:
         """
         Extract text with timing and error handling.
         
         Args:
             pdf_path: Path to the PDF file
+            analysis: Optional PdfAnalysis of the PDF (see extract_with_metadata)
+            output_file: Optional file to stream the pages to with
+                         ``extract_pages``; the result then carries the
+                         counts and ``output_file`` but no text
+            progress: Callback told about the extraction's progress (see
+                      ProgressCallback); pages are only reported when
+                      streamed to ``output_file``
             
         Returns:
             ExtractionResult with timing and metadata
         """
         start_time = time.time()
+        # The first page is under way from here on
+        progress("extractor", {"name": self.name, "page_separator": self.page_separator})
+        progress("pages", 1)
         
         try:
-            text = self.extract(pdf_path)
+            if output_file is not None:
+                metadata = {}
+                pages = self.extract_pages(pdf_path, analysis, metadata, progress)
+                counter = write_pages(_reported_pages(pages, progress), output_file, self.page_separator)
+                
+                return ExtractionResult(
+                    extractor_name=self.name,
+                    text="",
+                    success=True,
+                    execution_time_seconds=time.time() - start_time,
+                    char_count=counter.char_count,
+                    word_count=counter.word_count,
+                    line_count=counter.line_count,
+                    metadata=metadata,
+                    output_file=str(output_file),
+                )
+            
+            text, metadata = self.extract_with_metadata(pdf_path, analysis)
             execution_time = time.time() - start_time
             
             return ExtractionResult(
@@ -70,6 +318,7 @@ class BaseExtractor(ABC):
                 text=text,
                 success=True,
                 execution_time_seconds=execution_time,
+                metadata=metadata,
             )
         except Exception as e:
             execution_time = time.time() - start_time
@@ -0,0 +1,166 @@
+"""Hybrid extractor: PDF text layer per page, OCR only where needed."""
+
+from contextlib import closing, nullcontext
+from pathlib import Path
+from typing import Iterator, Optional
+
+import fitz  # PyMuPDF
+
+from utils.classify_pdf import KEEP_TEXT_CHARS, analyze_page_numbers, kept_chars
+from utils.extraction_cache import cache_key, page_fingerprint
+
+from .base import BaseExtractor, ProgressCallback, no_progress
+from .ocr_extractor import OCRExtractor, PipelineStats
+
+
+class HybridExtractor(BaseExtractor):
+    """
+    Route each page to the PyMuPDF text layer or to OCR.
+    
+    Pages flagged by ``should_force_ocr`` go through OCRExtractor's
+    layout+OCR path; all other pages keep their embedded text. Page texts
+    are stitched back together in page order, and streamed page by page
+    by ``extract_pages``.
+    """
+    
+    name = "Hybrid"
+    description = "PyMuPDF text layer per page, OCR for pages flagged by should_force_ocr"
+    supports_ocr = True
+    # The OCR settings of the shared OCRExtractor are part of the output config
+    pooled_dependencies = (OCRExtractor,)
+    
+    def __init__(self, ocr_extractor: Optional[OCRExtractor] = None, page_cache=None):
+        """
+        Initialize the hybrid extractor.
+        
+        Args:
+            ocr_extractor: OCRExtractor used for flagged pages
+                           (default: a newly constructed one)
+            page_cache: Optional ExtractionCache for OCR'd pages, keyed by
+                        page content so unchanged pages are not OCR'd again
+        """
+        self.ocr = ocr_extractor if ocr_extractor is not None else OCRExtractor()
+        self.page_cache = page_cache
+        self._ocr_config = self.ocr.output_config
+    
+    @classmethod
+    def from_pool(cls, pool, **kwargs) -> "HybridExtractor":
+        """Build a hybrid extractor sharing the pool's OCRExtractor."""
+        ocr_extractor, _ = pool.get(OCRExtractor)
+        return cls(ocr_extractor=ocr_extractor, **kwargs)
+    
+    def extract(self, pdf_path: Path) -> str:
+        """Extract text, OCR-ing only the pages that need it."""
+        text, _ = self.extract_with_metadata(pdf_path)
+        return text
+    
+    def extract_with_metadata(self, pdf_path: Path, analysis=None) -> tuple[str, dict]:
+        """Extract text and record the routing decision of every page."""
+        metadata = {}
+        text = self.page_separator.join(self.extract_pages(pdf_path, analysis, metadata))
+        return text, metadata
+    
+    def extract_pages(
+        self,
+        pdf_path: Path,
+        analysis=None,
+        metadata: Optional[dict] = None,
+        progress: ProgressCallback = no_progress,
+    ) -> Iterator[str]:
+        """
+        Yield the text of every page in page order, recording the routing
+        decision of every page in ``metadata``.
+        
+        With an ``analysis`` from the classification pass, its per-page
+        decisions and texts are reused and the file is only reopened if
+        some page needs OCR. A sampled (partial) analysis is completed
+        here, analyzing only the pages it did not inspect. Text pages whose
+        text the analysis did not keep (``KEEP_TEXT_CHARS``) are read from
+        the file again. OCR'd pages are
+        yielded as soon as their layout batch is done. ``progress`` is told
+        of the pages left to analyze and of the OCR's rendered pages and
+        layout batches.
+        """
+        if analysis is not None and analysis.complete:
+            pages = analysis.pages
+        else:
+            known = {p.number: p for p in analysis.pages} if analysis is not None else {}
+            with fitz.open(pdf_path) as doc:
+                progress("pages", max(1, len(doc) - len(known)))
+                missing = analyze_page_numbers(
+                    doc,
+                    (n for n in range(len(doc)) if n not in known),
+                    keep_chars=KEEP_TEXT_CHARS - kept_chars(known.values()),
+                )
+            known.update((p.number, p) for p in missing)
+            pages = [known[number] for number in sorted(known)]
+        
+        page_routes = []
+        ocr_page_numbers = []
+        stats = PipelineStats()
+        
+        for p in pages:
+            page_routes.append({
+                "page": p.number,
+                "route": "ocr" if p.force_ocr else "text",
+                "reason": p.info["reason"],
+                "img_cover": round(p.info["img_cover"], 3),
+                "score": round(p.info["score"], 3),
+            })
+            if p.force_ocr:
+                ocr_page_numbers.append(p.number)
+        
+        page_cache_hits = 0
+        if ocr_page_numbers:
+            with fitz.open(pdf_path) as doc:
+                # Look OCR pages up by content; only misses go through OCR
+                cached_texts = {}
+                page_keys = {}
+                pending = ocr_page_numbers
+                if self.page_cache is not None:
+                    for page_no in ocr_page_numbers:
+                        key = cache_key(page_fingerprint(doc, doc[page_no]), "OCRExtractor:page", self._ocr_config)
+                        entry = self.page_cache.get(key)
+                        if entry is None:
+                            page_keys[page_no] = key
+                        else:
+                            cached_texts[page_no] = entry["text"]
+                            page_cache_hits += 1
+                    pending = sorted(page_keys)
+                
+                # OCR'd pages come back in page order, interleaved with the rest
+                with closing(self.ocr.ocr_pages(doc, pending, stats, progress)) as ocr_texts:
+                    for p in pages:
+                        if not p.force_ocr:
+                            yield p.text if p.text is not None else self.ocr.page_text(doc, p.number)
+                        elif p.number in cached_texts:
+                            yield cached_texts[p.number]
+                        else:
+                            page_no, page_text = next(ocr_texts)
+                            if page_no in page_keys:
+                                self.page_cache.put(page_keys[page_no], {"text": page_text})
+                            yield page_text
+        else:
+            reread = any(p.text is None for p in pages)
+            with fitz.open(pdf_path) if reread else nullcontext() as doc:
+                for p in pages:
+                    yield p.text if p.text is not None else doc[p.number].get_text()
+        
+        if metadata is None:
+            return
+        metadata.update({
+            "text_pages": len(pages) - len(ocr_page_numbers),
+            "ocr_pages": len(ocr_page_numbers),
+            "page_routes": page_routes,
+            "pipeline": stats.as_dict(),
+        })
+        if stats.blank_keys:
+            metadata["blank_pages"] = sorted(stats.blank_keys)
+        region_cache = self.ocr.region_cache_summary(stats)
+        if region_cache is not None:
+            metadata["region_cache"] = region_cache
+        if self.page_cache is not None:
+            metadata["page_cache"] = {
+                "hits": page_cache_hits,
+                "misses": len(ocr_page_numbers) - page_cache_hits,
+            }
@@ -1,14 +1,89 @@
 """OCR-based extractor using PaddleOCR and PP-DocLayoutV2."""
 
+from dataclasses import asdict, dataclass, field, fields
 from pathlib import Path
-from typing import Optional
+import queue
+import threading
+import time
+from typing import Iterable, Iterator, Optional
 
 import fitz  # PyMuPDF
 import numpy as np
 from PIL import Image
-from paddleocr import LayoutDetection, PaddleOCR
 
-from .base import BaseExtractor
+from utils.classify_pdf import korean_text_quality
+from utils.reading_order import xy_cut_order
+from utils.region_cache import RegionCache
+from utils.timing import apportion, span
+
+from .base import BaseExtractor, ProgressCallback, no_progress
+
+# Layout labels whose regions are OCR'd as text
+TEXT_LIKE_LABELS = {"text", "paragraph_title", "document_title", "abstract", "references", "sidebar_text"}
+
+# Sentinel closing the render queue
+_RENDER_DONE = object()
+
+
+@dataclass
+class PipelineStats:
+    """Busy/idle seconds of the render and inference stages of the OCR path."""
+    
+    pages: int = 0
+    render_busy_seconds: float = 0.0
+    render_idle_seconds: float = 0.0  # blocked on a full queue
+    inference_busy_seconds: float = 0.0
+    inference_idle_seconds: float = 0.0  # waiting for a rendered page
+    region_render_seconds: float = 0.0  # full-DPI clip renders (part of inference busy)
+    regions_ocr: int = 0
+    regions_text_layer: int = 0  # taken from the PDF text layer instead of OCR
+    region_cache_hits: int = 0  # repeated regions answered by the region cache
+    blank_check_seconds: float = 0.0  # low-DPI blank checks (part of render busy)
+    blank_keys: list = field(default_factory=list)  # keys of pages skipped as blank
+    
+    def blank_seconds_saved(self) -> float:
+        """
+        Estimated seconds saved by skipping blank pages: their count times
+        the mean render + inference time of the pages with content, less
+        the cost of the blank checks.
+        """
+        content_pages = self.pages - len(self.blank_keys)
+        if not self.blank_keys or content_pages <= 0:
+            return 0.0
+        per_page = (self.render_busy_seconds - self.blank_check_seconds + self.inference_busy_seconds) / content_pages
+        return max(0.0, len(self.blank_keys) * per_page - self.blank_check_seconds)
+    
+    def split(self, page_counts: list[int], blank_keys: list[list]) -> list["PipelineStats"]:
+        """
+        Share the stats of a stream over the documents it held, in
+        proportion to their pages: seconds pro rata, counters by
+        ``apportion`` so they still add up. Pages and blank keys are each
+        document's own.
+        
+        Args:
+            page_counts: Pages of each document
+            blank_keys: Keys of each document's blank pages
+        """
+        total = sum(page_counts)
+        weights = [n / total if total else 1 / len(page_counts) for n in page_counts]
+        parts = [PipelineStats(pages=n, blank_keys=list(keys)) for n, keys in zip(page_counts, blank_keys)]
+        for f in fields(self):
+            if f.name in ("pages", "blank_keys"):
+                continue
+            value = getattr(self, f.name)
+            if isinstance(value, float):
+                shares = [value * w for w in weights]
+            else:
+                shares = apportion(value, weights)
+            for part, share in zip(parts, shares):
+                setattr(part, f.name, share)
+        return parts
+    
+    def as_dict(self) -> dict:
+        stats = {k: round(v, 4) if isinstance(v, float) else v for k, v in asdict(self).items()}
+        stats["blank_pages"] = len(stats.pop("blank_keys"))
+        stats["blank_seconds_saved"] = round(self.blank_seconds_saved(), 4)
+        return stats
 
 
 class OCRExtractor(BaseExtractor):
@@ -17,6 +92,27 @@ class OCRExtractor(BaseExtractor):
     name = "OCRExtractor"
     description = "OCR-based extractor using PaddleOCR and PP-DocLayoutV2"
     supports_ocr = True
+    page_separator = "\n\n"
+    # 2: XY-cut reading order (gap_ratio is a minimum gutter width)
+    cache_version = 2
+    output_options = (
+        "layout_model_name",
+        "recognition_model_name",
+        "use_doc_orientation_classify",
+        "use_doc_unwarping",
+        "use_textline_orientation",
+        "dpi",
+        "layout_dpi",
+        "gap_ratio",
+        "margin",
+        "reuse_text_layer",
+        "text_layer_quality",
+        "region_cache",
+        "skip_blank_pages",
+        "blank_check_dpi",
+        "blank_confirm_dpi",
+        "blank_max_ink",
+    )
     
     def __init__(
         self,
@@ -26,8 +122,23 @@ class OCRExtractor(BaseExtractor):
         use_doc_unwarping: bool = False,
         use_textline_orientation: bool = True,
         dpi: int = 300,
-        gap_ratio: float = 0.25,
+        layout_dpi: Optional[int] = 150,
+        gap_ratio: float = 0.01,
         margin: int = 8,
+        ocr_batch_size: int = 16,
+        layout_batch_size: int = 4,
+        prefetch_pages: int = 2,
+        reuse_text_layer: bool = True,
+        text_layer_quality: float = 0.35,
+        region_cache: Optional[str] = "exact",
+        region_cache_size: int = 4096,
+        region_store=None,
+        skip_blank_pages: bool = True,
+        blank_check_dpi: int = 36,
+        blank_confirm_dpi: int = 100,
+        blank_max_ink: int = 8,
+        layout_predictor=None,
+        ocr_predictor=None,
     ):
         """
         Initialize the OCR extractor.
@@ -39,34 +150,252 @@ class OCRExtractor(BaseExtractor):
             use_doc_unwarping: Whether to use document unwarping
             use_textline_orientation: Whether to use textline orientation
             dpi: DPI for rendering PDF pages to images
-            gap_ratio: Ratio for detecting column gaps
+            layout_dpi: DPI of the page render used for layout detection;
+                        text regions are then re-rendered at ``dpi`` only
+                        for their clip rectangle (None renders every page
+                        once at ``dpi`` and crops from it)
+            gap_ratio: Minimum width of a column gutter between layout
+                       boxes, as a fraction of the page width
             margin: Margin in pixels for cropping regions
+            ocr_batch_size: Region crops built (and, with ``layout_dpi``,
+                            rendered) at a time and sent to PaddleOCR in one
+                            predict call; also PaddleOCR's text-recognition
+                            batch size. Bounds the crops held in memory;
+                            PaddleOCR still detects the text lines of one
+                            crop at a time
+            layout_batch_size: Number of rendered pages sent to the layout
+                               model in one predict call
+            prefetch_pages: Depth of the queue between the renderer thread
+                            and inference (0 renders inline); each queued
+                            page holds one full-DPI RGB image in memory
+            reuse_text_layer: Take a layout region's text from the PDF text
+                              layer instead of OCR when that text scores at
+                              least ``text_layer_quality``
+            text_layer_quality: Minimum ``korean_text_quality`` score of a
+                                region's text layer for it to be reused
+            region_cache: Reuse the OCR text of repeated regions (headers,
+                          footers, stamps) matched by "exact" pixels or by a
+                          "perceptual" thumbnail hash, plus their position
+                          (None OCRs every region; see utils.region_cache)
+            region_cache_size: Regions kept in the in-memory region cache
+            region_store: Optional ExtractionCache persisting the region
+                          cache across documents, workers and runs
+            skip_blank_pages: Skip the layout render, layout detection and
+                              OCR of pages without text layer and without
+                              ink (see ``is_blank_page``)
+            blank_check_dpi: DPI of the first, coarse blank-check render
+            blank_confirm_dpi: DPI of the render confirming a blank page
+            blank_max_ink: Most adjacent ink-pixel pairs a confirmed blank
+                           page may have (dust, scanner specks)
+            layout_predictor: Optional ready-made layout model with the
+                              ``LayoutDetection.predict`` interface (e.g. a
+                              benchmark stub); skips loading PP-DocLayoutV2
+            ocr_predictor: Optional ready-made OCR model with the
+                           ``PaddleOCR.predict`` interface
         """
-        self.layout = LayoutDetection(model_name=layout_model_name)
-        self.ocr = PaddleOCR(
-            text_recognition_model_name=recognition_model_name,
-            use_doc_orientation_classify=use_doc_orientation_classify,
-            use_doc_unwarping=use_doc_unwarping,
-            use_textline_orientation=use_textline_orientation,
-        )
+        # Output config from the option values as passed, like
+        # ExtractorPool.cache_config (attributes hold normalized values and
+        # the objects built from them)
+        options = locals()
+        self.output_config = self.cache_config(**{name: options[name] for name in self.output_options})
+        
+        if layout_predictor is None or ocr_predictor is None:
+            # Imported here so injected predictors work without PaddleOCR installed
+            from paddleocr import LayoutDetection, PaddleOCR
+        
+        if layout_predictor is None:
+            layout_predictor = LayoutDetection(model_name=layout_model_name)
+        if ocr_predictor is None:
+            ocr_predictor = PaddleOCR(
+                text_recognition_model_name=recognition_model_name,
+                use_doc_orientation_classify=use_doc_orientation_classify,
+                use_doc_unwarping=use_doc_unwarping,
+                use_textline_orientation=use_textline_orientation,
+                text_recognition_batch_size=max(1, ocr_batch_size),
+            )
+        self.layout = layout_predictor
+        self.ocr = ocr_predictor
+        self.layout_model_name = layout_model_name
+        self.recognition_model_name = recognition_model_name
+        self.use_doc_orientation_classify = use_doc_orientation_classify
+        self.use_doc_unwarping = use_doc_unwarping
+        self.use_textline_orientation = use_textline_orientation
         self.dpi = dpi
+        self.layout_dpi = layout_dpi if layout_dpi and layout_dpi < dpi else None
         self.gap_ratio = gap_ratio
         self.margin = margin
+        self.ocr_batch_size = max(1, ocr_batch_size)
+        self.layout_batch_size = max(1, layout_batch_size)
+        self.prefetch_pages = max(0, prefetch_pages)
+        self.reuse_text_layer = reuse_text_layer
+        self.text_layer_quality = text_layer_quality
+        self.skip_blank_pages = skip_blank_pages
+        self.blank_check_dpi = blank_check_dpi
+        self.blank_confirm_dpi = blank_confirm_dpi
+        self.blank_max_ink = blank_max_ink
+        self.region_cache = None
+        if region_cache:
+            store_config = {k: v for k, v in self.output_config.items() if k != "region_cache"}
+            self.region_cache = RegionCache(region_cache, region_cache_size, region_store, store_config)
+        # PyMuPDF is not thread-safe: while the renderer thread runs, fitz is
+        # called from two threads, so page loads, renders and text-layer
+        # reads (page attributes included) all take this lock, and so does
+        # dropping the last reference to a page, which frees it in MuPDF.
+        # Documents are opened and closed only while no renderer thread is
+        # running.
+        self._fitz_lock = threading.Lock()
     
     def render_page_to_rgb(self, page, dpi: Optional[int] = None) -> np.ndarray:
         """Render a PDF page to RGB numpy array."""
         if dpi is None:
             dpi = self.dpi
         mat = fitz.Matrix(dpi / 72, dpi / 72)
-        pix = page.get_pixmap(matrix=mat, alpha=False)
-        img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
-        return np.array(img)
+        with span("render", page.number):
+            with self._fitz_lock:
+                pix = page.get_pixmap(matrix=mat, alpha=False)
+            img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+            return np.array(img)
+    
+    def _ink_mask(self, page, dpi: int) -> np.ndarray:
+        """
+        Pixels of a grayscale render more than 64 levels off the paper (the
+        90th brightness percentile, so gray or yellowed scans count as paper
+        too), darker or lighter: on a negative (white-on-black) scan the
+        paper is dark and the ink light.
+        """
+        mat = fitz.Matrix(dpi / 72, dpi / 72)
+        with self._fitz_lock:
+            pix = page.get_pixmap(matrix=mat, colorspace=fitz.csGRAY, alpha=False)
+        gray = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width)
+        if gray.size == 0:
+            return np.zeros((0, 0), dtype=bool)
+        cumulative = np.cumsum(np.bincount(gray.ravel(), minlength=256))
+        paper = int(np.searchsorted(cumulative, 0.9 * gray.size))
+        return np.abs(gray.astype(np.int16) - paper) > 64
     
-    def order_boxes_two_columns(self, boxes, page_w: float, gap_ratio: Optional[float] = None) -> list:
+    def is_blank_page(self, page) -> bool:
         """
-        Simple 2-column heuristic:
-        - Look at x-centers; if there's a big gap, split into left/right columns.
-        - Return boxes ordered top->bottom within each column, left column first.
+        Whether a page has no text layer and no ink.
+        
+        A page with any text in its text layer is never blank. Otherwise a
+        ``blank_check_dpi`` grayscale render must show no ink pixel at all
+        (downsampling averages scanner speckle away, while even a lone page
+        number leaves some), and a ``blank_confirm_dpi`` render at most
+        ``blank_max_ink`` pairs of adjacent ink pixels: isolated specks are
+        allowed, strokes of the smallest text are not.
+        """
+        with span("blank_check", page.number):
+            with self._fitz_lock:
+                has_text = bool(page.get_text("text").strip())
+            if has_text or self._ink_mask(page, self.blank_check_dpi).any():
+                return False
+            ink = self._ink_mask(page, self.blank_confirm_dpi)
+            pairs = np.count_nonzero(ink[:, 1:] & ink[:, :-1]) + np.count_nonzero(ink[1:] & ink[:-1])
+            return pairs <= self.blank_max_ink
+    
+    def render_for_layout(self, page, stats: PipelineStats) -> Optional[np.ndarray]:
+        """Render a page for layout detection, or return None if it is blank."""
+        if self.skip_blank_pages:
+            start_time = time.perf_counter()
+            blank = self.is_blank_page(page)
+            stats.blank_check_seconds += time.perf_counter() - start_time
+            if blank:
+                return None
+        return self.render_page_to_rgb(page, dpi=self.layout_dpi)
+    
+    def render_region_to_rgb(self, page, coord, coord_dpi: int, margin: Optional[int] = None) -> np.ndarray:
+        """
+        Render one page region at full DPI using a clip rectangle.
+        
+        Args:
+            page: fitz page
+            coord: (x1, y1, x2, y2) region in pixels of a ``coord_dpi`` render
+            coord_dpi: DPI of the render the coordinates refer to
+            margin: Margin in full-DPI pixels added around the region
+        """
+        if margin is None:
+            margin = self.margin
+        scale = 72 / coord_dpi
+        pad = margin * 72 / self.dpi
+        x1, y1, x2, y2 = coord
+        
+        # Clip rectangles are in (rotated) display coordinates, like the render
+        clip = fitz.Rect(x1 * scale - pad, y1 * scale - pad, x2 * scale + pad, y2 * scale + pad)
+        with self._fitz_lock:
+            clip &= page.rect
+        if clip.is_empty:
+            return np.zeros((0, 0, 3), dtype=np.uint8)
+        
+        mat = fitz.Matrix(self.dpi / 72, self.dpi / 72)
+        with span("render_region", page.number):
+            with self._fitz_lock:
+                pix = page.get_pixmap(matrix=mat, clip=clip, alpha=False)
+            img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+            return np.array(img)
+    
+    def page_text(self, doc, page_no: int) -> str:
+        """Text layer of one page of ``doc``, safe while ``ocr_pages`` iterates it."""
+        with self._fitz_lock:
+            page = doc[page_no]
+            text = page.get_text()
+            page = None
+        return text
+    
+    def text_layer_words(self, page) -> Optional[tuple[np.ndarray, list]]:
+        """
+        Words of a page's text layer with their boxes in display coordinates.
+        
+        Returns:
+            Tuple of ((N, 4) word boxes in points of the rotated page, as
+            rendered; ``page.get_text("words")`` entries), or None if the
+            page has no text layer
+        """
+        with self._fitz_lock:
+            words = page.get_text("words")
+            rotation = page.rotation_matrix
+        if not words:
+            return None
+        boxes = np.array([tuple(fitz.Rect(w[:4]) * rotation) for w in words], dtype=np.float64)
+        return boxes, words
+    
+    def region_text_layer(self, words: tuple, coord, coord_dpi: int) -> str:
+        """
+        Text-layer text inside one layout region.
+        
+        Args:
+            words: ``text_layer_words`` of the page
+            coord: (x1, y1, x2, y2) region in pixels of a ``coord_dpi`` render
+            coord_dpi: DPI of the render the coordinates refer to
+        
+        Returns:
+            The words whose centers fall in the region (plus crop margin),
+            one text line per line, in text-layer order
+        """
+        boxes, entries = words
+        scale = 72 / coord_dpi
+        pad = self.margin * 72 / self.dpi
+        x1, y1, x2, y2 = (c * scale for c in coord)
+        
+        cx = (boxes[:, 0] + boxes[:, 2]) / 2
+        cy = (boxes[:, 1] + boxes[:, 3]) / 2
+        inside = np.flatnonzero(
+            (cx >= x1 - pad) & (cx <= x2 + pad) & (cy >= y1 - pad) & (cy <= y2 + pad)
+        )
+        
+        lines = []
+        line_key = None
+        for i in inside:
+            _, _, _, _, word, block_no, line_no, _ = entries[i]
+            if (block_no, line_no) != line_key:
+                lines.append([])
+                line_key = (block_no, line_no)
+            lines[-1].append(word)
+        return "\n".join(" ".join(line) for line in lines)
+    
+    def order_boxes(self, boxes, page_w: float, gap_ratio: Optional[float] = None) -> list:
+        """
+        Order layout boxes for reading with a recursive XY-cut (any number
+        of columns, spanning headers and figures; see utils.reading_order).
         """
         if not boxes:
             return boxes
@@ -74,21 +403,11 @@ class OCRExtractor(BaseExtractor):
         if gap_ratio is None:
             gap_ratio = self.gap_ratio
         
-        centers = sorted(((b["coordinate"][0] + b["coordinate"][2]) / 2.0) for b in boxes)
-        gaps = [centers[i+1] - centers[i] for i in range(len(centers) - 1)]
-        if not gaps or max(gaps) < gap_ratio * page_w:
-            # probably single column: top->bottom, left->right
-            return sorted(boxes, key=lambda b: (b["coordinate"][1], b["coordinate"][0]))
-        
-        i = max(range(len(gaps)), key=lambda k: gaps[k])
-        split_x = (centers[i] + centers[i+1]) / 2.0
-        
-        left = [b for b in boxes if (b["coordinate"][0] + b["coordinate"][2]) / 2.0 < split_x]
-        right = [b for b in boxes if b not in left]
-        
-        left = sorted(left, key=lambda b: b["coordinate"][1])
-        right = sorted(right, key=lambda b: b["coordinate"][1])
-        return left + right
+        coords = np.array([b["coordinate"] for b in boxes], dtype=np.float64)
+        return [boxes[i] for i in xy_cut_order(coords, min_gap_x=gap_ratio * page_w)]
+    
+    # Former name, from when only two columns were supported
+    order_boxes_two_columns = order_boxes
     
     def crop_with_margin(self, img, coord, margin: Optional[int] = None) -> np.ndarray:
         """Crop image region with margin."""
@@ -102,42 +421,452 @@ class OCRExtractor(BaseExtractor):
         y2 = min(h, y2 + margin)
         return img[y1:y2, x1:x2]
     
+    def text_regions(self, page_layout: dict, page_w: float) -> list:
+        """Keep the text-like boxes of a layout result, in reading order."""
+        text_like = [
+            b for b in page_layout["boxes"]
+            if str(b.get("label", "")).lower() in TEXT_LIKE_LABELS
+        ]
+        return self.order_boxes(text_like, page_w=page_w)
+    
+    def ocr_page_stream(
+        self,
+        pages: Iterable[tuple],
+        stats: Optional[PipelineStats] = None,
+        progress: ProgressCallback = no_progress,
+    ) -> Iterator[tuple]:
+        """
+        OCR a stream of pages, batching layout detection across pages.
+        
+        With ``prefetch_pages > 0`` a renderer thread consumes ``pages`` and
+        renders upcoming pages into a bounded queue while layout detection
+        and OCR run on the current batch. Blank pages (``skip_blank_pages``)
+        yield empty text without layout detection. With ``layout_dpi`` set, pages
+        are queued as low-DPI renders and each text region is re-rendered
+        at full DPI after layout detection, so page objects (and their
+        documents) must stay valid until their text has been yielded.
+        
+        Args:
+            pages: (key, fitz page) pairs
+            stats: Optional PipelineStats accumulating per-stage busy/idle time
+            progress: Callback told of each rendered page and of each layout
+                      batch ("pages", with the batch size), and of the pages
+                      OCR'd once a batch is done ("ocr", with the batch size)
+        
+        Yields:
+            (key, page_text) tuples in input order
+        """
+        if stats is None:
+            stats = PipelineStats()
+        
+        if self.prefetch_pages > 0:
+            rendered = self._render_ahead(pages, stats)
+        else:
+            rendered = self._render_inline(pages, stats)
+        
+        batch = []
+        for item in rendered:
+            progress("pages", 1)
+            batch.append(item)
+            if len(batch) >= self.layout_batch_size:
+                progress("pages", len(batch))
+                results = self._ocr_rendered_batch(batch, stats)
+                progress("ocr", len(results))
+                # Dropping the last page references frees MuPDF pages too
+                with self._fitz_lock:
+                    batch = item = None
+                yield from results
+                batch = []
+        
+        if batch:
+            progress("pages", len(batch))
+            results = self._ocr_rendered_batch(batch, stats)
+            progress("ocr", len(results))
+            with self._fitz_lock:
+                batch = item = None
+            yield from results
+    
+    def _render_inline(self, pages: Iterable[tuple], stats: PipelineStats) -> Iterator[tuple]:
+        """Render pages on the calling thread."""
+        for key, page in pages:
+            start_time = time.perf_counter()
+            img = self.render_for_layout(page, stats)
+            stats.render_busy_seconds += time.perf_counter() - start_time
+            yield key, page, img
+    
+    def _render_ahead(self, pages: Iterable[tuple], stats: PipelineStats) -> Iterator[tuple]:
+        """Render pages on a background thread into a bounded queue."""
+        rendered = queue.Queue(maxsize=self.prefetch_pages)
+        stop = threading.Event()
+        
+        def produce():
+            try:
+                for key, page in pages:
+                    if stop.is_set():
+                        break
+                    start_time = time.perf_counter()
+                    item = (key, page, self.render_for_layout(page, stats))
+                    rendered_time = time.perf_counter()
+                    rendered.put(item)
+                    with self._fitz_lock:
+                        item = page = None
+                    stats.render_busy_seconds += rendered_time - start_time
+                    stats.render_idle_seconds += time.perf_counter() - rendered_time
+            except BaseException as e:
+                rendered.put(e)
+            finally:
+                # Close page generators (and the documents they hold open) on this thread
+                close = getattr(pages, "close", None)
+                if close is not None:
+                    close()
+                rendered.put(_RENDER_DONE)
+        
+        producer = threading.Thread(target=produce, name="ocr-render", daemon=True)
+        producer.start()
+        try:
+            while True:
+                start_time = time.perf_counter()
+                item = rendered.get()
+                stats.inference_idle_seconds += time.perf_counter() - start_time
+                
+                if item is _RENDER_DONE:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+                with self._fitz_lock:
+                    item = None
+        finally:
+            # Unblock and retire the producer if the consumer stopped early
+            stop.set()
+            while producer.is_alive():
+                try:
+                    item = rendered.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                with self._fitz_lock:
+                    item = None
+            producer.join()
+    
+    def _ocr_rendered_batch(self, batch: list, stats: PipelineStats) -> list[tuple]:
+        """Run one layout predict call over rendered pages, then OCR their regions."""
+        start_time = time.perf_counter()
+        # Blank pages were not rendered (img is None) and keep empty text
+        content = [page_idx for page_idx, (_, _, img) in enumerate(batch) if img is not None]
+        stats.blank_keys.extend(key for key, _, img in batch if img is None)
+        
+        layout_out = []
+        if content:
+            images = [batch[page_idx][2] for page_idx in content]
+            # LayoutDetection accepts a list of numpy.ndarray; one Result (with `.json`) per image
+            with span("layout", batch[content[0]][1].number):
+                layout_out = self.layout.predict(images, batch_size=len(images), layout_nms=True)
+        
+        # Regions of every page, so OCR is batched across the pages too;
+        # regions with a usable text layer skip OCR
+        jobs = []  # (page_idx, coord) of each region to OCR
+        owners = []
+        region_texts = []  # per region in reading order; None until OCR'd
+        coord_dpi = self.layout_dpi or self.dpi
+        for page_idx, res in zip(content, layout_out):
+            _, page, img = batch[page_idx]
+            words = self.text_layer_words(page) if self.reuse_text_layer else None
+            for b in self.text_regions(res.json["res"], page_w=img.shape[1]):
+                owners.append(page_idx)
+                if words is not None:
+                    layer_text = self.region_text_layer(words, b["coordinate"], coord_dpi)
+                    if korean_text_quality(layer_text)["score"] >= self.text_layer_quality:
+                        region_texts.append(layer_text.strip())
+                        stats.regions_text_layer += 1
+                        continue
+                
+                region_texts.append(None)
+                jobs.append((page_idx, b["coordinate"]))
+        
+        # Crops (full-DPI clip renders with layout_dpi) are built one OCR
+        # chunk at a time, so at most ocr_batch_size are held at once
+        ocr_texts = []
+        for start in range(0, len(jobs), self.ocr_batch_size):
+            crops = []
+            crop_keys = []
+            for page_idx, coord in jobs[start:start + self.ocr_batch_size]:
+                _, page, img = batch[page_idx]
+                if self.layout_dpi:
+                    region_start = time.perf_counter()
+                    crops.append(self.render_region_to_rgb(page, coord, self.layout_dpi))
+                    stats.region_render_seconds += time.perf_counter() - region_start
+                else:
+                    crops.append(self.crop_with_margin(img, coord))
+                if self.region_cache is not None:
+                    crop_keys.append(self.region_cache.key(crops[-1], coord, img.shape[1::-1]))
+            ocr_texts.extend(self.recognize_cached(crops, crop_keys, stats))
+        ocr_texts = iter(ocr_texts)
+        
+        page_parts = [[] for _ in batch]
+        for page_idx, block_text in zip(owners, region_texts):
+            if block_text is None:
+                block_text = next(ocr_texts)
+            if block_text:
+                page_parts[page_idx].append(block_text)
+        
+        stats.pages += len(batch)
+        stats.inference_busy_seconds += time.perf_counter() - start_time
+        return [(key, "\n".join(parts)) for (key, _, _), parts in zip(batch, page_parts)]
+    
+    def recognize_cached(self, crops: list, keys: list, stats: PipelineStats) -> list[str]:
+        """
+        ``recognize_regions`` through the region cache: each distinct key is
+        looked up once and only the misses are OCR'd.
+        
+        Args:
+            crops: Region images (numpy arrays), in reading order
+            keys: ``RegionCache.key`` of each crop (ignored without a cache)
+            stats: PipelineStats counting OCR'd and cached regions
+        
+        Returns:
+            Recognized text of each crop, aligned with ``crops``
+        """
+        if self.region_cache is None:
+            stats.regions_ocr += len(crops)
+            return self.recognize_regions(crops)
+        
+        texts = [None] * len(crops)
+        pending = {}  # key -> indices of the crops sharing it
+        for i, key in enumerate(keys):
+            if key in pending:
+                pending[key].append(i)
+                continue
+            cached = self.region_cache.get(key)
+            if cached is None:
+                pending[key] = [i]
+            else:
+                texts[i] = cached
+        
+        pending_keys = list(pending)
+        recognized = self.recognize_regions([crops[pending[key][0]] for key in pending_keys])
+        for key, text in zip(pending_keys, recognized):
+            self.region_cache.put(key, text)
+            for i in pending[key]:
+                texts[i] = text
+        
+        stats.regions_ocr += len(pending_keys)
+        stats.region_cache_hits += len(crops) - len(pending_keys)
+        return texts
+    
+    def region_cache_summary(self, stats: PipelineStats) -> Optional[dict]:
+        """Region cache hits/misses of ``stats`` for result metadata (None if disabled)."""
+        if self.region_cache is None:
+            return None
+        return {"hits": stats.region_cache_hits, "misses": stats.regions_ocr}
+    
+    def recognize_regions(self, crops: list) -> list[str]:
+        """
+        OCR region crops in batches of ``ocr_batch_size``.
+        
+        Args:
+            crops: Region images (numpy arrays), in reading order
+        
+        Returns:
+            Recognized text of each crop, aligned with ``crops``
+        """
+        texts = [""] * len(crops)
+        # Degenerate boxes can produce empty crops; PaddleOCR rejects them
+        pending = [i for i, crop in enumerate(crops) if crop.size > 0]
+        
+        for start in range(0, len(pending), self.ocr_batch_size):
+            chunk = pending[start:start + self.ocr_batch_size]
+            
+            # OCR the cropped regions (detect+recognize inside each region);
+            # predict() on a list returns one Result per input, in order
+            with span("ocr"):
+                ocr_out = self.ocr.predict([crops[i] for i in chunk])
+            for i, res in zip(chunk, ocr_out):
+                lines = res.json["res"].get("rec_texts", [])
+                texts[i] = "\n".join(lines).strip()
+        
+        return texts
+    
+    def ocr_pages(
+        self,
+        doc,
+        page_numbers: Optional[Iterable[int]] = None,
+        stats: Optional[PipelineStats] = None,
+        progress: ProgressCallback = no_progress,
+    ) -> Iterator[tuple[int, str]]:
+        """
+        OCR selected pages of an open document.
+        
+        The caller must not use ``doc`` while iterating, since the renderer
+        thread reads from it.
+        
+        Args:
+            doc: Open fitz document
+            page_numbers: 0-based page numbers to OCR (default: all pages)
+            stats: Optional PipelineStats accumulating per-stage busy/idle time
+            progress: Callback told of rendered pages and layout batches
+        
+        Yields:
+            (page_number, page_text) tuples in the order requested
+        """
+        if page_numbers is None:
+            page_numbers = range(len(doc))
+        
+        def pages():
+            # Runs on the renderer thread, alongside fitz calls of the consumer
+            for page_no in page_numbers:
+                with self._fitz_lock:
+                    page = doc[page_no]
+                try:
+                    yield page_no, page
+                finally:
+                    with self._fitz_lock:
+                        page = None
+        
+        yield from self.ocr_page_stream(pages(), stats, progress)
+    
     def extract(self, pdf_path: Path) -> str:
         """Extract text from PDF using PaddleOCR with layout detection."""
-        text_parts = []
+        text, _ = self.extract_with_metadata(pdf_path)
+        return text
+    
+    def extract_pages(
+        self,
+        pdf_path: Path,
+        analysis=None,
+        metadata: Optional[dict] = None,
+        progress: ProgressCallback = no_progress,
+    ) -> Iterator[str]:
+        """
+        Yield the OCR text page by page, skipping pages without text.
+        
+        ``metadata`` receives the per-stage pipeline timings and the
+        0-based numbers of the pages skipped as blank.
+        """
+        yield from self.extract_page_range(pdf_path, metadata=metadata, progress=progress)
+    
+    def extract_page_range(
+        self,
+        pdf_path: Path,
+        start: int = 0,
+        stop: Optional[int] = None,
+        metadata: Optional[dict] = None,
+        progress: ProgressCallback = no_progress,
+    ) -> Iterator[str]:
+        """
+        Yield the OCR text of pages ``start`` to ``stop`` (exclusive),
+        skipping pages without text.
+        
+        Only that range is rendered, so shards of one document can run in
+        separate processes; joining the shard texts (those not empty) with
+        ``page_separator`` gives the text of the whole range.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            start: First 0-based page number
+            stop: Page number after the last one (default: end of document)
+            metadata: Optional dict receiving the pipeline stats, as in
+                      ``extract_pages``
+            progress: Callback told of rendered pages and layout batches
+        """
+        stats = PipelineStats()
         
         with fitz.open(pdf_path) as doc:
-            for page_idx, page in enumerate(doc):
-                page_img = self.render_page_to_rgb(page)
-                page_h, page_w = page_img.shape[:2]
-                
-                # LayoutDetection supports numpy.ndarray input; output is a Result object with `.json`
-                layout_out = self.layout.predict(page_img, batch_size=1, layout_nms=True)
-                page_layout = layout_out[0].json["res"]
-                
-                # Keep only text-like regions
-                text_like = []
-                for b in page_layout["boxes"]:
-                    label = str(b.get("label", "")).lower()
-                    if label in {"text", "paragraph_title", "document_title", "abstract", "references", "sidebar_text"}:
-                        text_like.append(b)
-                
-                ordered = self.order_boxes_two_columns(text_like, page_w=page_w)
-                
-                page_text_parts = []
-                for b in ordered:
-                    crop = self.crop_with_margin(page_img, b["coordinate"])
-                    
-                    # OCR the cropped region (detect+recognize inside that region)
-                    ocr_out = self.ocr.predict(crop)  # numpy.ndarray input
-                    ocr_json = ocr_out[0].json["res"]
-                    lines = ocr_json.get("rec_texts", [])
-                    block_text = "\n".join(lines).strip()
-                    
-                    if block_text:
-                        page_text_parts.append(block_text)
-                
-                if page_text_parts:
-                    text_parts.append("\n".join(page_text_parts))
+            stop = len(doc) if stop is None else min(stop, len(doc))
+            for _, page_text in self.ocr_pages(doc, range(start, stop), stats, progress):
+                if page_text:
+                    yield page_text
+        
+        if metadata is not None:
+            self.pipeline_metadata(stats, metadata)
+    
+    def pipeline_metadata(self, stats: PipelineStats, metadata: dict) -> None:
+        """Record the pipeline stats, blank pages and region cache counts of ``stats``."""
+        metadata["pipeline"] = stats.as_dict()
+        if stats.blank_keys:
+            metadata["blank_pages"] = stats.blank_keys
+        region_cache = self.region_cache_summary(stats)
+        if region_cache is not None:
+            metadata["region_cache"] = region_cache
+    
+    def extract_documents(
+        self,
+        pdf_paths: list[Path],
+        metadata: Optional[list[dict]] = None,
+        progress: ProgressCallback = no_progress,
+    ) -> Iterator[tuple[int, list[str]]]:
+        """
+        OCR several documents through one page stream, keyed by (document,
+        page), so layout batches span documents: a run of 1-3 page scans
+        fills ``layout_batch_size`` instead of sending each document's few
+        pages on their own.
+        
+        The documents are open until the generator is exhausted or closed;
+        meant for small documents, whose page texts are held until their
+        last page is done.
+        
+        Args:
+            pdf_paths: Paths to the PDF files
+            metadata: Optional list of dicts, one per document, receiving its
+                      metadata as in ``extract_pages`` once the generator is
+                      exhausted; the stream's stats are shared out by page
+                      count (``PipelineStats.split``)
+            progress: Callback told of rendered pages and layout batches
+        
+        Yields:
+            (index in ``pdf_paths``, page texts without the empty ones) of
+            each document in order, once its last page is done
+        """
+        stats = PipelineStats()
+        docs = []
+        stream = None
+        try:
+            for pdf_path in pdf_paths:
+                docs.append(fitz.open(pdf_path))
+            page_counts = [len(doc) for doc in docs]
+            
+            def pages():
+                # Runs on the renderer thread, like ocr_pages
+                for doc_idx, doc in enumerate(docs):
+                    for page_no in range(len(doc)):
+                        with self._fitz_lock:
+                            page = doc[page_no]
+                        try:
+                            yield (doc_idx, page_no), page
+                        finally:
+                            with self._fitz_lock:
+                                page = None
+            
+            stream = self.ocr_page_stream(pages(), stats, progress)
+            current = 0
+            texts = []
+            for (doc_idx, _), page_text in stream:
+                # Pages come in input order, so earlier documents are done
+                while current < doc_idx:
+                    yield current, texts
+                    current += 1
+                    texts = []
+                if page_text:
+                    texts.append(page_text)
+            while current < len(docs):
+                yield current, texts
+                current += 1
+                texts = []
+        finally:
+            # Retire the renderer thread before closing the documents
+            if stream is not None:
+                stream.close()
+            for doc in docs:
+                doc.close()
         
-        return "\n\n".join(text_parts)
+        if metadata is not None:
+            blank_keys = [[] for _ in docs]
+            for doc_idx, page_no in stats.blank_keys:
+                blank_keys[doc_idx].append(page_no)
+            for part, doc_metadata in zip(stats.split(page_counts, blank_keys), metadata):
+                self.pipeline_metadata(part, doc_metadata)
+    
+    def extract_with_metadata(self, pdf_path: Path, analysis=None) -> tuple[str, dict]:
+        """Extract text and report per-stage pipeline timings."""
+        metadata = {}
+        text = self.page_separator.join(self.extract_pages(pdf_path, analysis, metadata))
+        return text, metadata
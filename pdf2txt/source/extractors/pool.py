@@ -0,0 +1,188 @@
+"""Process-local pool of reusable extractor instances."""
+
+from pathlib import Path
+import threading
+import time
+from typing import Optional
+
+from utils.timing import span
+
+from .base import BaseExtractor, ExtractionResult, ProgressCallback, no_progress
+from .registry import extractor_key, resolve_extractor
+
+
+class ExtractorPool:
+    """
+    Construct each extractor type once per process and reuse it.
+    
+    Model-backed extractors (e.g. OCRExtractor) load their weights in
+    ``__init__``, so building one per PDF makes model loading dominate the
+    run time of short documents. The pool builds an extractor lazily the
+    first time it is requested and hands out the same instance afterwards.
+    ``warm_up`` builds one ahead of time on a background thread, so model
+    loading overlaps with other work.
+    """
+    
+    def __init__(self, options: Optional[dict] = None):
+        """
+        Initialize the pool.
+        
+        Extractors are built with their ``from_pool(pool, **kwargs)``
+        classmethod if they define one (to share pooled components), else
+        with their constructor.
+        
+        Args:
+            options: Optional mapping of extractor class or registry name
+                to constructor keyword arguments; kept picklable so worker
+                processes can build identically configured pools (names
+                avoid importing extractors that are never used)
+        """
+        self.options = {extractor_key(k): v for k, v in (options or {}).items()}
+        self._instances: dict[type, BaseExtractor] = {}
+        # Background builds started by warm_up: class -> thread, and their failures
+        self._warming: dict[type, threading.Thread] = {}
+        self._warm_errors: dict[type, BaseException] = {}
+    
+    def get(self, extractor_cls) -> tuple[BaseExtractor, float]:
+        """
+        Return the pooled instance of an extractor class.
+        
+        Args:
+            extractor_cls: Extractor class or registry name to look up
+        
+        Returns:
+            Tuple of (extractor, load seconds paid by this call); the load
+            time is 0.0 whenever the instance already existed
+        """
+        extractor_cls = resolve_extractor(extractor_cls)
+        warming = self._warming.pop(extractor_cls, None)
+        if warming is not None:
+            # Pay only the part of the warm-up that is still running
+            start_time = time.perf_counter()
+            with span("model_wait"):
+                warming.join()
+            wait_time = time.perf_counter() - start_time
+            error = self._warm_errors.pop(extractor_cls, None)
+            if error is not None:
+                raise error
+            return self._instances[extractor_cls], wait_time
+        
+        extractor = self._instances.get(extractor_cls)
+        if extractor is not None:
+            return extractor, 0.0
+        
+        start_time = time.perf_counter()
+        with span("model_load"):
+            extractor = self._build(extractor_cls)
+        return extractor, time.perf_counter() - start_time
+    
+    def _build(self, extractor_cls: type) -> BaseExtractor:
+        kwargs = self.options.get(extractor_key(extractor_cls), {})
+        from_pool = getattr(extractor_cls, "from_pool", None)
+        
+        if from_pool is not None:
+            extractor = from_pool(self, **kwargs)
+        else:
+            extractor = extractor_cls(**kwargs)
+        
+        self._instances[extractor_cls] = extractor
+        return extractor
+    
+    def warm_up(self, extractor_cls) -> None:
+        """
+        Start building an extractor on a background thread.
+        
+        Does nothing if it is already built or being built. The next
+        ``get`` of the class waits for the build and reports only that
+        wait as its load time. Extractors built ``from_pool`` should not be
+        warmed up while the pool is used on another thread, since their
+        dependencies are built from the warm-up thread.
+        
+        Args:
+            extractor_cls: Extractor class or registry name to build
+        """
+        extractor_cls = resolve_extractor(extractor_cls)
+        if extractor_cls in self._instances or extractor_cls in self._warming:
+            return
+        
+        def build():
+            try:
+                self._build(extractor_cls)
+            except BaseException as e:
+                self._warm_errors[extractor_cls] = e
+        
+        thread = threading.Thread(target=build, name=f"warm-up-{extractor_key(extractor_cls)}", daemon=True)
+        self._warming[extractor_cls] = thread
+        thread.start()
+    
+    def is_ready(self, extractor_cls) -> bool:
+        """Whether ``get`` would return without building or waiting."""
+        extractor_cls = resolve_extractor(extractor_cls)
+        warming = self._warming.get(extractor_cls)
+        if warming is not None:
+            return not warming.is_alive()
+        return extractor_cls in self._instances
+    
+    def cache_config(self, extractor_cls) -> dict:
+        """
+        Output-affecting config of an extractor as this pool would build it,
+        without constructing it (so cache lookups never load models).
+        """
+        extractor_cls = resolve_extractor(extractor_cls)
+        config = extractor_cls.cache_config(**self.options.get(extractor_key(extractor_cls), {}))
+        for dependency in getattr(extractor_cls, "pooled_dependencies", ()):
+            config[dependency.name] = self.cache_config(dependency)
+        return config
+    
+    def extract_with_timing(
+        self,
+        extractor_cls,
+        pdf_path: Path,
+        analysis=None,
+        output_file: Optional[Path] = None,
+        progress: ProgressCallback = no_progress,
+    ) -> ExtractionResult:
+        """
+        Extract with the pooled extractor, reporting model load separately.
+        
+        Args:
+            extractor_cls: Extractor class or registry name to use
+            pdf_path: Path to the PDF file
+            analysis: Optional PdfAnalysis of the PDF, passed to the extractor
+            output_file: Optional file to stream the text to page by page
+            progress: Callback told about the extraction's progress
+        
+        Returns:
+            ExtractionResult whose ``model_load_time_seconds`` holds the
+            construction time paid for this document (if any)
+        """
+        extractor, load_time = self.get(extractor_cls)
+        result = extractor.extract_with_timing(pdf_path, analysis, output_file, progress)
+        result.model_load_time_seconds = load_time
+        return result
+    
+    def clear(self) -> None:
+        """Drop all pooled instances so they can be garbage collected."""
+        for thread in self._warming.values():
+            thread.join()
+        self._warming.clear()
+        self._warm_errors.clear()
+        self._instances.clear()
+
+
+_default_pool: Optional[ExtractorPool] = None
+
+
+def default_pool() -> ExtractorPool:
+    """Return the process-wide extractor pool, creating it on first use."""
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = ExtractorPool()
+    return _default_pool
+
+
+def init_default_pool(options: Optional[dict] = None) -> ExtractorPool:
+    """Replace the process-wide extractor pool with a configured one."""
+    global _default_pool
+    _default_pool = ExtractorPool(options)
+    return _default_pool
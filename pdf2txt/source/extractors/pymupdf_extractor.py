@@ -1,10 +1,12 @@
 """PyMuPDF (fitz) extractor."""
 
+from contextlib import nullcontext
 from pathlib import Path
+from typing import Iterator, Optional
 
 import fitz  # PyMuPDF
 
-from .base import BaseExtractor
+from .base import BaseExtractor, ProgressCallback, no_progress
 
 
 class PyMuPDFExtractor(BaseExtractor):
@@ -16,11 +18,33 @@ class PyMuPDFExtractor(BaseExtractor):
     
     def extract(self, pdf_path: Path) -> str:
         """Extract text from PDF using PyMuPDF."""
-        text_parts = []
+        return self.page_separator.join(self.extract_pages(pdf_path))
+    
+    def extract_pages(
+        self,
+        pdf_path: Path,
+        analysis=None,
+        metadata: Optional[dict] = None,
+        progress: ProgressCallback = no_progress,
+    ) -> Iterator[str]:
+        """Yield the text layer page by page, reusing a classification pass if given."""
+        if analysis is not None and analysis.complete:
+            # Pages were already parsed by analyze_pdf; the file is only
+            # reopened for pages past its KEEP_TEXT_CHARS
+            if metadata is not None:
+                metadata["reused_analysis"] = True
+            reread = any(p.text is None for p in analysis.pages)
+            with fitz.open(pdf_path) if reread else nullcontext() as doc:
+                for p in analysis.pages:
+                    yield p.text if p.text is not None else doc[p.number].get_text()
+            return
         
         with fitz.open(pdf_path) as doc:
             for page in doc:
-                text_parts.append(page.get_text())
-        
-        return "\n".join(text_parts)
-
+                yield page.get_text()
+    
+    def extract_with_metadata(self, pdf_path: Path, analysis=None) -> tuple[str, dict]:
+        """Extract text, reusing the page texts of a classification pass if given."""
+        metadata = {}
+        text = self.page_separator.join(self.extract_pages(pdf_path, analysis, metadata))
+        return text, metadata
@@ -0,0 +1,48 @@
+"""Registry of extractor classes, imported on first use."""
+
+import importlib
+
+# Public name -> "module:Class" (module relative to this package). Modules
+# are only imported when an extractor is looked up, so a run that never
+# needs OCR does not load the OCR path (PIL, the region cache, PaddleOCR).
+EXTRACTORS = {
+    "HybridExtractor": ".hybrid_extractor:HybridExtractor",
+    "OCRExtractor": ".ocr_extractor:OCRExtractor",
+    "PyMuPDFExtractor": ".pymupdf_extractor:PyMuPDFExtractor",
+    # "PDFMinerExtractor": ".pdfminer_extractor:PDFMinerExtractor",
+    # "PDFPlumberExtractor": ".pdfplumber_extractor:PDFPlumberExtractor",
+    # "PyPDFExtractor": ".pypdf_extractor:PyPDFExtractor",
+    # "PyTesseractExtractor": ".pytesseract_extractor:PyTesseractExtractor",
+    # "MarkerExtractor": ".marker_extractor:MarkerExtractor",
+    # "DoclingExtractor": ".docling_extractor:DoclingExtractor",
+}
+
+
+def get_extractor_class(name: str) -> type:
+    """
+    Look up an extractor class by its registry name, importing its module.
+    
+    Args:
+        name: Key of ``EXTRACTORS`` (the class name)
+        
+    Returns:
+        The extractor class
+    """
+    try:
+        target = EXTRACTORS[name]
+    except KeyError:
+        raise ValueError(f"Unknown extractor: {name!r}") from None
+    module_name, class_name = target.split(":")
+    return getattr(importlib.import_module(module_name, __package__), class_name)
+
+
+def resolve_extractor(extractor) -> type:
+    """Return ``extractor`` itself if it is a class, else look its name up."""
+    if isinstance(extractor, str):
+        return get_extractor_class(extractor)
+    return extractor
+
+
+def extractor_key(extractor) -> str:
+    """Registry name of an extractor class or name (its class name)."""
+    return extractor if isinstance(extractor, str) else extractor.__name__
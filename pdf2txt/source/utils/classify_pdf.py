@@ -1,19 +1,33 @@
 import fitz  # PyMuPDF
+import math
+import numpy as np
 import re
 import unicodedata
 import os
+from dataclasses import dataclass, field
+from typing import Optional
+
+from utils.timing import span
 
 CID_RE = re.compile(r"\(cid:\d+\)")
+# Pages per analyze_pages call: enough to batch the text quality scoring,
+# few enough not to keep many fitz pages alive at once
+PAGE_CHUNK = 64
+# Characters of page text an analysis keeps for the extractors to reuse;
+# later pages keep text=None and are read again from the file, so a large
+# document is never held in memory whole
+KEEP_TEXT_CHARS = 1 << 20
 
 def rect_area(r):
     return max(0.0, (r.x1 - r.x0) * (r.y1 - r.y0))
 
-def image_coverage_ratio(page):
+def image_coverage_ratio(page, blocks=None):
     page_rect = page.rect
     page_area = rect_area(page_rect) or 1.0
 
     # blocks: (x0, y0, x1, y1, text_or_meta, block_no, block_type)
-    blocks = page.get_text("blocks")  # block_type 0=text, 1=image 
+    if blocks is None:
+        blocks = page.get_text("blocks")  # block_type 0=text, 1=image 
 
     img_area = 0.0
     for x0, y0, x1, y1, _, _, block_type in blocks:
@@ -23,6 +37,10 @@ def image_coverage_ratio(page):
 
     return min(1.0, img_area / page_area)
 
+def text_from_blocks(blocks):
+    # Same as page.get_text("text"): text blocks already end each line with "\n"
+    return "".join(b[4] for b in blocks if b[6] == 0)
+
 def korean_text_quality(s: str):
     # Strip whitespace for ratios
     stripped = "".join(ch for ch in s if not ch.isspace())
@@ -35,6 +53,9 @@ def korean_text_quality(s: str):
     cid_hits = len(CID_RE.findall(s))
     control = sum(unicodedata.category(ch)[0] == "C" for ch in stripped)
 
+    return _quality_scores(n, korean, replacement, control, cid_hits)
+
+def _quality_scores(n, korean, replacement, control, cid_hits):
     korean_ratio = korean / n
     repl_ratio = replacement / n
     ctrl_ratio = control / n
@@ -55,13 +76,82 @@ def korean_text_quality(s: str):
         "score": max(0.0, min(1.0, score)),
     }
 
+# BMP lookup tables of korean_text_quality_batch, built on first use:
+# whitespace (str.isspace) and Unicode category C* (control, format,
+# surrogate, private use, unassigned)
+_BMP_SPACE = None
+_BMP_CONTROL = None
+
+
+def _bmp_tables():
+    global _BMP_SPACE, _BMP_CONTROL
+    if _BMP_SPACE is None:
+        chars = [chr(cp) for cp in range(0x10000)]
+        _BMP_SPACE = np.fromiter((ch.isspace() for ch in chars), dtype=bool, count=0x10000)
+        _BMP_CONTROL = np.fromiter((unicodedata.category(ch)[0] == "C" for ch in chars), dtype=bool, count=0x10000)
+    return _BMP_SPACE, _BMP_CONTROL
+
+
+def korean_text_quality_batch(texts):
+    # Same result as [korean_text_quality(t) for t in texts], scored in one
+    # numpy pass over the codepoints of all texts instead of three Python
+    # loops per character
+    if not texts:
+        return []
+    space_table, control_table = _bmp_tables()
+
+    lengths = np.fromiter((len(t) for t in texts), dtype=np.int64, count=len(texts))
+    cps = np.frombuffer("".join(texts).encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+
+    bmp = np.minimum(cps, 0xFFFF)
+    non_space = ~space_table[bmp]
+    korean = (cps >= 0xAC00) & (cps <= 0xD7A3)
+    replacement = cps == 0xFFFD
+    control = control_table[bmp] & non_space
+
+    # Outside the BMP nothing is whitespace; look up the category in Python
+    astral = np.flatnonzero(cps > 0xFFFF)
+    if astral.size:
+        non_space[astral] = True
+        control[astral] = [unicodedata.category(chr(cps[i]))[0] == "C" for i in astral]
+
+    # Per-text sums over the concatenation (reduceat needs non-empty segments)
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    nonempty = lengths > 0
+    def per_text(mask):
+        sums = np.zeros(len(texts), dtype=np.int64)
+        if nonempty.any():
+            sums[nonempty] = np.add.reduceat(mask.astype(np.int64), starts[nonempty])
+        return sums
+
+    ns = per_text(non_space)
+    koreans = per_text(korean)
+    replacements = per_text(replacement)
+    controls = per_text(control)
+
+    results = []
+    for i, text in enumerate(texts):
+        n = int(ns[i])
+        if n == 0:
+            results.append({"n": 0, "score": 0.0})
+            continue
+        results.append(_quality_scores(n, int(koreans[i]), int(replacements[i]),
+                                       int(controls[i]), len(CID_RE.findall(text))))
+    return results
+
+
 def should_force_ocr(page,
                      img_cover_threshold=0.85,
                      min_text_chars=50,
-                     quality_threshold=0.35):
-    img_cover = image_coverage_ratio(page)
-    text = page.get_text("text")  # fast plain text
-    q = korean_text_quality(text)
+                     quality_threshold=0.35,
+                     blocks=None,
+                     quality=None):
+    # One "blocks" parse gives both the image geometry and the plain text;
+    # `quality` may come precomputed from korean_text_quality_batch
+    if blocks is None:
+        blocks = page.get_text("blocks")
+    img_cover = image_coverage_ratio(page, blocks)
+    q = quality if quality is not None else korean_text_quality(text_from_blocks(blocks))
 
     # Rule 1: mostly image => treat as scanned / overlay; OCR anyway
     if img_cover >= img_cover_threshold:
@@ -78,26 +168,197 @@ def should_force_ocr(page,
     return False, {"reason": "use_pdf_text", "img_cover": img_cover, **q}
 
 
-def classify_pdf(pdf_path: str, force_ratio_thresh: float = 0.85, avg_size_per_page_thresh: float = 10 * 1024):
-    doc = fitz.open(pdf_path)
-    total_forces = 0
-    for i, page in enumerate(doc):
-        force, info = should_force_ocr(page)
-        if force:
-            total_forces += 1
+# Per-page artifact of the classification pass, reused by the extractors;
+# text is None once the analysis is past KEEP_TEXT_CHARS
+@dataclass
+class PageAnalysis:
+    number: int
+    text: Optional[str]
+    force_ocr: bool
+    info: dict
+
+
+@dataclass
+class PdfAnalysis:
+    pdf_path: str
+    pdf_type: str
+    file_size: int
+    force_ratio: float
+    avg_size_per_page: float
+    pages: list = field(default_factory=list)
+    # Sampling mode may decide before every page was analyzed; `pages` then
+    # holds only the inspected pages (in page order)
+    total_pages: int = 0
+    decided_by: str = "full_scan"  # "full_scan" | "sample" | "file_size"
+
+    @property
+    def complete(self):
+        return len(self.pages) == self.total_pages
+
+    def summary(self):
+        return {
+            "pages_inspected": len(self.pages),
+            "total_pages": self.total_pages,
+            "decided_by": self.decided_by,
+            "force_ratio": round(self.force_ratio, 3),
+        }
 
-    # Calculate and print average file size per page
-    total_pages = len(doc)
+
+def analyze_pages(pages, keep_chars=None):
+    # Parse and score pages (text blocks, force-OCR decision), with the text
+    # quality scored in one batch (spans cover the whole chunk, so their
+    # counts are per chunk); page texts are kept while they fit in
+    # keep_chars (default: KEEP_TEXT_CHARS)
+    if keep_chars is None:
+        keep_chars = KEEP_TEXT_CHARS
+    pages = list(pages)
+    with span("page_blocks"):
+        blocks = [page.get_text("blocks") for page in pages]
+        texts = [text_from_blocks(b) for b in blocks]
+    with span("text_quality"):
+        qualities = korean_text_quality_batch(texts)
+
+    analyses = []
+    with span("force_ocr_rules"):
+        for page, page_blocks, text, q in zip(pages, blocks, texts, qualities):
+            force, info = should_force_ocr(page, blocks=page_blocks, quality=q)
+            keep = len(text) <= keep_chars
+            if keep:
+                keep_chars -= len(text)
+            analyses.append(PageAnalysis(number=page.number, text=text if keep else None, force_ocr=force, info=info))
+    return analyses
+
+
+def kept_chars(analyses):
+    return sum(len(p.text) for p in analyses if p.text is not None)
+
+
+def analyze_page_numbers(doc, numbers, chunk=PAGE_CHUNK, keep_chars=None):
+    # analyze_pages over the given pages of an open document, chunk by chunk,
+    # keeping at most keep_chars (default: KEEP_TEXT_CHARS) of page text over
+    # all of them
+    if keep_chars is None:
+        keep_chars = KEEP_TEXT_CHARS
+    numbers = list(numbers)
+    analyses = []
+    for start in range(0, len(numbers), chunk):
+        chunk_analyses = analyze_pages((doc[i] for i in numbers[start:start + chunk]), keep_chars)
+        keep_chars -= kept_chars(chunk_analyses)
+        analyses.extend(chunk_analyses)
+    return analyses
+
+
+def spread_order(n):
+    # Van der Corput order (0, n/2, n/4, 3n/4, ...): every prefix is spread
+    # over the whole document, and all n pages come out eventually
+    bits = max(1, (n - 1).bit_length())
+    seen = set()
+    for i in range(1 << bits):
+        idx = (int(format(i, f"0{bits}b")[::-1], 2) * n) >> bits
+        if idx not in seen:
+            seen.add(idx)
+            yield idx
+
+
+def wilson_bounds(k, n, population, z):
+    # Wilson score interval of k/n, narrowed by the finite population
+    # correction since pages are sampled without replacement
+    if n == 0:
+        return 0.0, 1.0
+    p = k / n
+    if n >= population:
+        return p, p
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    margin *= math.sqrt((population - n) / (population - 1))
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+def analyze_pdf(pdf_path: str, force_ratio_thresh: float = 0.85, avg_size_per_page_thresh: float = 10 * 1024,
+                sample: bool = False, z: float = 2.576, min_sample: int = 8):
+    # sample=True inspects pages in spread order and stops as soon as the
+    # verdict is settled at confidence z (2.576 ~ 99%); "docx" needs every
+    # page checked, so it still ends in a full scan
     file_size = os.path.getsize(pdf_path)
 
-    force_ratio = total_forces / total_pages 
-    avg_size_per_page = file_size / total_pages
+    with fitz.open(pdf_path) as doc:
+        total_pages = len(doc)
+        avg_size_per_page = file_size / total_pages
+
+        # The file-size rule alone makes it "scanned"; no page needs a look
+        if sample and avg_size_per_page > avg_size_per_page_thresh:
+            return PdfAnalysis(
+                pdf_path=str(pdf_path),
+                pdf_type="scanned",
+                file_size=file_size,
+                force_ratio=0.0,
+                avg_size_per_page=avg_size_per_page,
+                total_pages=total_pages,
+                decided_by="file_size",
+            )
+
+        pages = []
+        total_forces = 0
+        pdf_type = None
+        if sample:
+            # Batched chunks in spread order, growing with the sample (to
+            # PAGE_CHUNK); the verdict is checked after each chunk, and an
+            # undecided sample carries on into the rest of the pages
+            order = list(spread_order(total_pages))
+            chunk = max(1, min_sample)
+            while len(pages) < total_pages:
+                analyses = analyze_pages(
+                    (doc[i] for i in order[len(pages):len(pages) + chunk]),
+                    KEEP_TEXT_CHARS - kept_chars(pages),
+                )
+                pages.extend(analyses)
+                total_forces += sum(p.force_ocr for p in analyses)
+                chunk = min(len(pages), PAGE_CHUNK)
+
+                if len(pages) >= min_sample and len(pages) < total_pages:
+                    lo, hi = wilson_bounds(total_forces, len(pages), total_pages, z)
+                    if lo > force_ratio_thresh:
+                        pdf_type = "scanned"
+                    elif total_forces > 0 and hi <= force_ratio_thresh:
+                        pdf_type = "mixed"
+                    if pdf_type is not None:
+                        break
+        else:
+            # Score the text quality of whole chunks of pages at once
+            pages = analyze_page_numbers(doc, range(total_pages))
+            total_forces = sum(p.force_ocr for p in pages)
+
+    pages.sort(key=lambda p: p.number)
+    force_ratio = total_forces / len(pages)
+
+    if pdf_type is not None:
+        decided_by = "sample"
+    else:
+        decided_by = "full_scan"
+        if force_ratio > force_ratio_thresh or avg_size_per_page > avg_size_per_page_thresh:
+            pdf_type = "scanned"
+        # Mostly text, but some pages need OCR => route per page
+        elif total_forces > 0:
+            pdf_type = "mixed"
+        else:
+            pdf_type = "docx"
+
+    return PdfAnalysis(
+        pdf_path=str(pdf_path),
+        pdf_type=pdf_type,
+        file_size=file_size,
+        force_ratio=force_ratio,
+        avg_size_per_page=avg_size_per_page,
+        pages=pages,
+        total_pages=total_pages,
+        decided_by=decided_by,
+    )
 
-    doc.close()
 
-    if force_ratio > force_ratio_thresh or avg_size_per_page > avg_size_per_page_thresh:
-        return "scanned"
-    return "docx"
+def classify_pdf(pdf_path: str, force_ratio_thresh: float = 0.85, avg_size_per_page_thresh: float = 10 * 1024,
+                 sample: bool = False):
+    return analyze_pdf(pdf_path, force_ratio_thresh, avg_size_per_page_thresh, sample=sample).pdf_type
     
 
 # Example usage:
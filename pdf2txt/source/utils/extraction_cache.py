@@ -0,0 +1,230 @@
+"""Content-addressed on-disk cache of extraction results."""
+
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Optional
+
+try:
+    import psutil
+except ImportError:  # in requirements.txt; without it only the age of temporary files counts
+    psutil = None
+
+# A process re-scans the cache directory after writing this fraction of the
+# size cap, to count the entries other processes wrote
+RESCAN_FRACTION = 1 / 16
+# Age after which a temporary file (<name>.<pid>.tmp) is removed on a
+# re-scan even if its writer's pid is alive (it may have been reused)
+STALE_TMP_SECONDS = 3600
+
+
+def file_sha256(path, chunk_size: int = 1 << 20) -> str:
+    """Hash the bytes of a file."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def page_fingerprint(doc, page) -> str:
+    """
+    Hash what a page renders from: its content stream and the streams of
+    the images, fonts and form XObjects it references, plus its geometry.
+    """
+    h = hashlib.sha256()
+    h.update(f"{tuple(page.rect)}|{page.rotation}".encode())
+    h.update(page.read_contents())
+
+    xrefs = [img[0] for img in page.get_images(full=True)]
+    xrefs += [font[0] for font in page.get_fonts(full=True)]
+    xrefs += [xobj[0] for xobj in page.get_xobjects()]
+    for xref in sorted(set(x for x in xrefs if x > 0)):
+        h.update(doc.xref_stream_raw(xref) or b"")
+    return h.hexdigest()
+
+
+def cache_key(content_hash: str, extractor_name: str, config: dict) -> str:
+    """Combine a content hash with the extractor and its output-affecting config."""
+    payload = json.dumps(
+        {"content": content_hash, "extractor": extractor_name, "config": config},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ExtractionCache:
+    """
+    On-disk cache of extraction results with a size cap and LRU eviction.
+
+    Entries are JSON files named by their key, optionally with a text file
+    of the same name (``put(..., text_file=...)``) so large texts are copied
+    file to file instead of being loaded into memory and embedded in the
+    JSON. A hit refreshes the entry's
+    mtime, and when the cache grows past ``max_bytes`` the entries with
+    the oldest mtime are removed first. Several processes may share one
+    cache directory; each keeps its own index and tolerates entries that
+    disappear underneath it.
+
+    The index is built from the directory (sorted by mtime) and then kept
+    in LRU order with a running byte total, so a put costs O(1) plus the
+    evictions it causes, however many entries the cache holds. Since that
+    total only sees this process's writes, the index is rebuilt after every
+    ``RESCAN_FRACTION`` of ``max_bytes`` written. The cap then holds across
+    processes sharing the directory: each can overshoot it by at most that
+    much.
+
+    Temporary files left by a writer that was killed (e.g. a batch worker at
+    its deadline) are removed by the re-scan once their pid is gone or they
+    are ``STALE_TMP_SECONDS`` old; the others count toward the cap.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 1024 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cache entries
+            max_bytes: Size cap of the directory; 0 disables eviction
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._index: Optional[OrderedDict[Path, int]] = None  # path -> size, least recently used first
+        self._total = 0
+        self._written = 0  # bytes put since the index was built
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def text_path(self, key: str) -> Path:
+        """Text file stored with the entry of ``key`` (see ``put``)."""
+        return self._path(key).with_suffix(".txt")
+
+    def get(self, key: str) -> Optional[dict]:
+        """
+        Return the cached entry for ``key``, or None on a miss.
+
+        An entry stored with a text file has ``entry["text_file"]`` set; the
+        file is at ``text_path(key)``.
+        """
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+            if entry.get("text_file") and not self.text_path(key).exists():
+                return None  # half evicted by another process
+            os.utime(path)  # mark as recently used
+        except (OSError, ValueError):
+            return None
+
+        if self._index is not None and path in self._index:
+            self._index.move_to_end(path)
+        return entry
+
+    def put(self, key: str, entry: dict, text_file: Optional[Path] = None) -> None:
+        """
+        Store an entry, then evict least recently used entries over the cap.
+
+        Args:
+            key: Cache key
+            entry: JSON-serializable entry
+            text_file: Optional text file copied into the cache with the
+                       entry (the entry is marked with ``"text_file": True``)
+        """
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write to temporary files first so readers never see partial files;
+        # the text goes first, so a visible entry always has its text
+        size = 0
+        if text_file is not None:
+            text_path = self.text_path(key)
+            tmp_path = text_path.with_name(f"{text_path.name}.{os.getpid()}.tmp")
+            try:
+                shutil.copyfile(text_file, tmp_path)
+                os.replace(tmp_path, text_path)
+            except BaseException:
+                tmp_path.unlink(missing_ok=True)
+                raise
+            size += text_path.stat().st_size
+            entry = {**entry, "text_file": True}
+
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        size += path.stat().st_size
+
+        index = self._load_index()
+        self._total -= index.pop(path, 0)
+        index[path] = size
+        self._total += size
+        self._written += size
+        self._evict()
+
+    def _load_index(self) -> OrderedDict[Path, int]:
+        if self._index is None:
+            entries = []
+            for path in self.cache_dir.glob("*/*.json"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                size = stat.st_size
+                try:
+                    size += path.with_suffix(".txt").stat().st_size
+                except OSError:
+                    pass
+                entries.append((stat.st_mtime, path, size))
+            entries.sort(key=lambda entry: entry[0])
+            self._index = OrderedDict((path, size) for _, path, size in entries)
+            self._total = sum(self._index.values()) + self._sweep_tmp_files()
+            self._written = 0
+        return self._index
+
+    def _sweep_tmp_files(self) -> int:
+        """
+        Remove the temporary files of writers that died or that are older
+        than ``STALE_TMP_SECONDS``.
+
+        Returns:
+            Bytes of the temporary files still being written
+        """
+        now = time.time()
+        live = 0
+        for tmp_path in self.cache_dir.glob("*/*.tmp"):
+            try:
+                stat = tmp_path.stat()
+            except OSError:
+                continue  # renamed into place meanwhile
+            pid = tmp_path.name.rsplit(".", 2)[-2]
+            writer_gone = (
+                psutil is not None and pid.isdigit() and int(pid) != os.getpid()
+                and not psutil.pid_exists(int(pid))
+            )
+            if writer_gone or now - stat.st_mtime > STALE_TMP_SECONDS:
+                tmp_path.unlink(missing_ok=True)
+            else:
+                live += stat.st_size
+        return live
+
+    def _evict(self) -> None:
+        if not self.max_bytes:
+            return
+
+        if self._written >= self.max_bytes * RESCAN_FRACTION:
+            self._index = None  # count what other processes wrote meanwhile
+        index = self._load_index()
+        while self._total > self.max_bytes and index:
+            path, size = index.popitem(last=False)
+            # Entry first, so no reader finds an entry without its text
+            path.unlink(missing_ok=True)  # missing if another process evicted it
+            path.with_suffix(".txt").unlink(missing_ok=True)
+            self._total -= size
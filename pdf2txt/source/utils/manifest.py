@@ -0,0 +1,106 @@
+"""Append-only JSONL manifest of finished PDFs, for resumable runs."""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from utils.extraction_cache import file_sha256
+
+MANIFEST_NAME = "manifest.jsonl"
+
+
+class Manifest:
+    """
+    Record each finished PDF as one JSON line.
+
+    Every line holds the PDF's size, mtime and sha256 plus the statistics
+    of its extraction results (no text). Lines are flushed and fsynced as
+    they are written, so a crashed run loses at most the PDF in flight.
+    Only the entries of the previous run (for ``is_complete``) are held in
+    memory; recorded entries are written out and not kept.
+    """
+
+    def __init__(self, path: Path, resume: bool = False):
+        """
+        Open the manifest.
+
+        Args:
+            path: Manifest file
+            resume: Keep existing entries and append; otherwise start empty
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.entries = load_manifest(self.path) if resume else {}
+        self._file = open(self.path, "a" if resume else "w", encoding="utf-8")
+
+        # Terminate a line left truncated by a crash before appending to it
+        if resume and self._file.tell() > 0:
+            with open(self.path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self._file.write("\n")
+
+    def is_complete(self, pdf_path: Path) -> bool:
+        """
+        Whether ``pdf_path`` finished successfully in an earlier run and is
+        unchanged since. Failed PDFs are retried.
+        """
+        entry = self.entries.get(str(pdf_path))
+        if entry is None or not all(r["success"] for r in entry["results"]):
+            return False
+
+        stat = pdf_path.stat()
+        if stat.st_size != entry["size"]:
+            return False
+        if stat.st_mtime == entry["mtime"]:
+            return True
+        # Touched but possibly unchanged: fall back to the content hash
+        return file_sha256(pdf_path) == entry["sha256"]
+
+    def record(self, pdf_path: Path, results: list, sha256: Optional[str] = None) -> None:
+        """
+        Append the entry of a finished PDF.
+
+        Args:
+            pdf_path: The PDF
+            results: Its extraction results
+            sha256: Content hash of the PDF if already known (else it is hashed here)
+        """
+        stat = pdf_path.stat()
+        entry = {
+            "pdf_file": str(pdf_path),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "sha256": sha256 or file_sha256(pdf_path),
+            "timestamp": datetime.now().isoformat(),
+            "results": [r.to_summary() for r in results],
+        }
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        # The previous run's entry is superseded and no longer needed
+        self.entries.pop(entry["pdf_file"], None)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def load_manifest(path: Path) -> dict[str, dict]:
+    """
+    Read a manifest into {pdf_file: entry}; later lines win. A truncated
+    last line (from a crash mid-write) is ignored.
+    """
+    entries = {}
+    if not Path(path).exists():
+        return entries
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            entries[entry["pdf_file"]] = entry
+    return entries
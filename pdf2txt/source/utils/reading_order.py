@@ -0,0 +1,100 @@
+"""Reading order of layout boxes by recursive XY-cut."""
+
+import numpy as np
+
+
+def _split(lo: np.ndarray, hi: np.ndarray, min_gap: float) -> list[np.ndarray]:
+    """
+    Split intervals [lo, hi] into groups separated by empty gaps wider than
+    ``min_gap``; returns index arrays in ascending order of position.
+    """
+    order = np.argsort(lo, kind="stable")
+    reach = np.maximum.accumulate(hi[order])
+    cuts = np.flatnonzero(lo[order[1:]] - reach[:-1] > min_gap) + 1
+    return np.split(order, cuts)
+
+
+def _covered(lo: np.ndarray, hi: np.ndarray, min_gap: float) -> list[tuple[float, float]]:
+    """Union of intervals, merging those separated by at most ``min_gap``."""
+    merged = []
+    for group in _split(lo, hi, min_gap):
+        merged.append((float(lo[group].min()), float(hi[group].max())))
+    return merged
+
+
+def _merge(covered: list[tuple[float, float]], min_gap: float) -> list[tuple[float, float]]:
+    """Merge interval unions, joining intervals separated by at most ``min_gap``."""
+    merged = []
+    for start, end in sorted(covered):
+        if merged and start - merged[-1][1] <= min_gap:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def xy_cut_order(boxes, min_gap_x: float = 0.0, min_gap_y: float = 0.0) -> np.ndarray:
+    """
+    Reading order of boxes by recursive XY-cut.
+
+    A set of boxes is first split at vertical gutters (gaps in the
+    x-projection wider than ``min_gap_x``) into columns, left to right, of
+    any number. Without a gutter it is split at horizontal gaps into bands,
+    top to bottom; consecutive bands stay together as long as together they
+    still have a gutter, so a header spanning the columns closes the band
+    group above it instead of cutting the columns into rows. Each part is
+    ordered the same way; boxes that cannot be separated (overlapping or
+    nested) are read top to bottom, left to right.
+
+    Each level sorts its boxes once, so a page costs O(n log n) per level of
+    nesting. Recursion runs on an explicit stack.
+
+    Args:
+        boxes: (N, 4) array-like of (x1, y1, x2, y2)
+        min_gap_x: Minimum width of a column gutter
+        min_gap_y: Minimum height of a gap between bands
+
+    Returns:
+        Indices into ``boxes`` in reading order
+    """
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    out = []
+    stack = [np.arange(len(boxes))]
+
+    while stack:
+        idx = stack.pop()
+        if len(idx) <= 1:
+            out.extend(idx.tolist())
+            continue
+
+        x0, y0, x1, y1 = boxes[idx].T
+
+        columns = _split(x0, x1, min_gap_x)
+        if len(columns) > 1:
+            stack.extend(idx[c] for c in reversed(columns))
+            continue
+
+        bands = _split(y0, y1, min_gap_y)
+        if len(bands) == 1:
+            out.extend(idx[np.lexsort((x0, y0))].tolist())
+            continue
+
+        # Merge consecutive bands while the merged block still has a gutter
+        groups = []
+        group = [bands[0]]
+        covered = _covered(x0[bands[0]], x1[bands[0]], min_gap_x)
+        for band in bands[1:]:
+            band_covered = _covered(x0[band], x1[band], min_gap_x)
+            merged = _merge(covered + band_covered, min_gap_x)
+            if len(merged) > 1:
+                group.append(band)
+                covered = merged
+            else:
+                groups.append(np.concatenate(group))
+                group = [band]
+                covered = band_covered
+        groups.append(np.concatenate(group))
+
+        stack.extend(idx[g] for g in reversed(groups))
+
+    return np.asarray(out, dtype=np.intp)
@@ -0,0 +1,131 @@
+"""Cache of region OCR results keyed by the region's pixels and position."""
+
+from collections import OrderedDict
+import hashlib
+from typing import Optional
+
+import numpy as np
+from PIL import Image
+
+from utils.extraction_cache import cache_key
+
+REGION_CACHE_MODES = ("exact", "perceptual")
+
+# Perceptual keys: grayscale thumbnail at most this wide, in 16 gray levels
+THUMBNAIL_WIDTH = 64
+# Positions are quantized to this fraction of the page size
+POSITION_STEP = 0.01
+
+
+class RegionCache:
+    """
+    Recognized text of layout regions, so repeated regions (letterheads,
+    footers, stamps) are OCR'd once.
+
+    A region's key combines a hash of its crop with its position on the
+    page, normalized by the page size and quantized to ``POSITION_STEP``.
+    The "exact" mode hashes the crop's pixels and only matches identical
+    renders (e.g. the same image XObject on every page). The "perceptual"
+    mode hashes a small, coarsely quantized grayscale thumbnail, which also
+    matches scans of the same printed block, at the risk of merging regions
+    that differ only in fine detail (such as a page number in a footer).
+
+    Entries live in an in-memory LRU for the lifetime of the cache (one run
+    of a worker process). With a persistent ExtractionCache, every
+    recognized region is also stored as its own entry under its region key,
+    as soon as it is OCR'd, and LRU misses are looked up there; regions are
+    then recognized once per corpus and across runs.
+    """
+
+    def __init__(
+        self,
+        mode: str = "exact",
+        max_entries: int = 4096,
+        store=None,
+        store_config: Optional[dict] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            mode: "exact" or "perceptual" (see the class docstring)
+            max_entries: Size cap of the in-memory LRU
+            store: Optional ExtractionCache persisting entries across
+                   documents, processes and runs
+            store_config: Output-affecting OCR config the persistent keys
+                          are scoped to
+        """
+        if mode not in REGION_CACHE_MODES:
+            raise ValueError(f"Unknown region cache mode: {mode!r}")
+        self.mode = mode
+        self.max_entries = max(1, max_entries)
+        self.store = store
+        self.store_config = {**(store_config or {}), "mode": mode}
+        self._entries: OrderedDict[str, str] = OrderedDict()
+
+    def key(self, crop: np.ndarray, coord, page_size: tuple[int, int]) -> str:
+        """
+        Key of one region crop.
+
+        Args:
+            crop: Region image (numpy array)
+            coord: (x1, y1, x2, y2) region in pixels of the page render
+            page_size: (width, height) of the page render ``coord`` refers to
+
+        Returns:
+            Hex digest of the crop hash and the quantized position
+        """
+        # SHA-1 is the fastest hashlib digest on large buffers; this is not
+        # a security boundary
+        h = hashlib.sha1()
+        if self.mode == "perceptual" and crop.size:
+            img = Image.fromarray(crop).convert("L")
+            width = min(THUMBNAIL_WIDTH, img.width)
+            height = max(1, round(img.height * width / img.width))
+            thumb = np.asarray(img.resize((width, height), Image.BILINEAR)) >> 4
+            h.update(f"{thumb.shape}".encode())
+            h.update(thumb.tobytes())
+        else:
+            h.update(f"{crop.shape}|{crop.dtype}".encode())
+            h.update(memoryview(np.ascontiguousarray(crop)).cast("B"))
+
+        page_w, page_h = page_size
+        x1, y1, x2, y2 = coord
+        position = (
+            round(x1 / page_w / POSITION_STEP),
+            round(y1 / page_h / POSITION_STEP),
+            round(x2 / page_w / POSITION_STEP),
+            round(y2 / page_h / POSITION_STEP),
+        )
+        h.update(f"|{position}".encode())
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached text for ``key``, or None on a miss."""
+        text = self._entries.get(key)
+        if text is not None:
+            self._entries.move_to_end(key)
+            return text
+        if self.store is None:
+            return None
+
+        entry = self.store.get(self._store_key(key))
+        if entry is None:
+            return None
+        self._remember(key, entry["text"])
+        return entry["text"]
+
+    def put(self, key: str, text: str) -> None:
+        """Store the recognized text of a region."""
+        self._remember(key, text)
+        if self.store is not None:
+            self.store.put(self._store_key(key), {"text": text})
+
+    def _store_key(self, key: str) -> str:
+        return cache_key(key, "OCRExtractor:region", self.store_config)
+
+    def _remember(self, key: str, text: str) -> None:
+        self._entries[key] = text
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
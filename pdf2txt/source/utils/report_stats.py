@@ -0,0 +1,138 @@
+"""Bounded-memory aggregation of extraction results for the comparison report."""
+
+import math
+import tempfile
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+
+class LogHistogram:
+    """
+    Approximate quantiles of positive values in fixed memory.
+
+    Values are counted in logarithmic bins, bin ``i`` covering
+    ``[min_value * growth**i, min_value * growth**(i+1))``, so a quantile is
+    off by at most a factor of ``growth`` (2% by default). Values at or
+    below ``min_value`` share one bin. Bins are stored sparsely; with the
+    defaults, timings between 0.1 ms and a day need at most ~1,000 bins.
+    """
+
+    def __init__(self, min_value: float = 1e-4, growth: float = 1.02):
+        self.min_value = min_value
+        self.growth = growth
+        self._log_growth = math.log(growth)
+        self.counts: dict[int, int] = {}
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        if value <= self.min_value:
+            index = -1
+        else:
+            index = int(math.log(value / self.min_value) / self._log_growth)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Value below which a fraction ``q`` of the added values lie (0.0 if empty)."""
+        if not self.count:
+            return 0.0
+
+        # Nearest rank: smallest bin with at least q of the values at or below it
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                if index < 0:
+                    return self.min_value
+                # Geometric midpoint of the bin
+                return self.min_value * self.growth ** (index + 0.5)
+        return self.min_value * self.growth ** (max(self.counts) + 0.5)
+
+
+@dataclass
+class ExtractorStats:
+    success_count: int = 0
+    total_count: int = 0
+    total_time: float = 0.0
+    total_load_time: float = 0.0
+    total_words: int = 0
+    times: LogHistogram = field(default_factory=LogHistogram)
+
+
+class ReportAggregator:
+    """
+    Reduce extraction results to report statistics as they arrive.
+
+    Per extractor only counters and a LogHistogram of successful run times
+    are kept, and the per-PDF report sections are spooled to a temporary
+    file with only their (offset, size) held in memory, so memory does not
+    grow with text volume.
+    Sections are replayed in ``order`` rather than arrival order, so
+    out-of-order completions (worker pools) still produce a report in
+    input order.
+    """
+
+    def __init__(self):
+        self.pdf_count = 0
+        self.extractors: dict[str, ExtractorStats] = {}
+        self.cache_counts = {"document": [0, 0], "page": [0, 0], "region": [0, 0]}  # [hits, misses]
+        self.blank_pages = 0
+        self.blank_seconds_saved = 0.0
+        self.worker_recycles: dict[str, int] = {}  # reason -> count
+        self.recycle_peak_rss_mb = 0.0
+        self._spool = tempfile.TemporaryFile()
+        self._sections: dict[int, tuple[int, int]] = {}  # order -> (offset, size)
+
+    def add(self, results: list, section: str, order: Optional[int] = None) -> None:
+        """
+        Fold the results of one PDF into the statistics.
+
+        Args:
+            results: ExtractionResults of the PDF (only their statistics are read)
+            section: Report section of the PDF, spooled to disk
+            order: Position of the section in the report (default: arrival order)
+        """
+        for r in results:
+            stats = self.extractors.setdefault(r.extractor_name, ExtractorStats())
+            stats.total_count += 1
+            stats.total_load_time += r.model_load_time_seconds
+            if r.success:
+                stats.success_count += 1
+                stats.total_time += r.execution_time_seconds
+                stats.total_words += r.word_count
+                stats.times.add(r.execution_time_seconds)
+
+            if "cache" in r.metadata:
+                self.cache_counts["document"][r.metadata["cache"] != "hit"] += 1
+            page_cache = r.metadata.get("page_cache")
+            if page_cache:
+                self.cache_counts["page"][0] += page_cache["hits"]
+                self.cache_counts["page"][1] += page_cache["misses"]
+            region_cache = r.metadata.get("region_cache")
+            if region_cache:
+                self.cache_counts["region"][0] += region_cache["hits"]
+                self.cache_counts["region"][1] += region_cache["misses"]
+            pipeline = r.metadata.get("pipeline")
+            if pipeline and r.metadata.get("cache") != "hit":
+                self.blank_pages += pipeline.get("blank_pages", 0)
+                self.blank_seconds_saved += pipeline.get("blank_seconds_saved", 0.0)
+            for event in r.metadata.get("worker_recycles", []):
+                self.worker_recycles[event["reason"]] = self.worker_recycles.get(event["reason"], 0) + 1
+                self.recycle_peak_rss_mb = max(self.recycle_peak_rss_mb, event["rss_mb"] or 0.0)
+
+        data = section.encode("utf-8")
+        self._spool.seek(0, 2)
+        self._sections[self.pdf_count if order is None else order] = (self._spool.tell(), len(data))
+        self._spool.write(data)
+        self.pdf_count += 1
+
+    def iter_sections(self) -> Iterator[str]:
+        """Yield the spooled per-PDF sections in report order."""
+        for order in sorted(self._sections):
+            offset, size = self._sections[order]
+            self._spool.seek(offset)
+            yield self._spool.read(size).decode("utf-8")
+
+    def close(self) -> None:
+        self._spool.close()
@@ -0,0 +1,161 @@
+"""Per-stage timing spans for profiling a run; a no-op unless enabled."""
+
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Iterator, Optional
+
+_enabled = False
+# Timings the spans of this process currently go to (see recording())
+_active: Optional["StageTimings"] = None
+_NULL_SPAN = nullcontext()
+
+
+def _empty_entry() -> dict:
+    return {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0, "max_page": None}
+
+
+def apportion(total: int, weights: list[float]) -> list[int]:
+    """
+    Split a count in proportion to ``weights`` (fractions summing to 1),
+    by largest remainder so the parts still add up to ``total``.
+    """
+    exact = [total * w for w in weights]
+    parts = [int(x) for x in exact]
+    by_remainder = sorted(range(len(exact)), key=lambda i: exact[i] - parts[i], reverse=True)
+    for i in by_remainder[:total - sum(parts)]:
+        parts[i] += 1
+    return parts
+
+
+def split_stages(stages: dict, weights: list[float]) -> list[dict]:
+    """
+    Share the totals of an ``as_dict()`` output out over several parts
+    (e.g. documents OCR'd through one page stream) in proportion to
+    ``weights``. Span counts are split by ``apportion`` and each part gets
+    their mean duration, so merging the parts gives back the counts and
+    totals; each part that got spans keeps the longest span of the whole
+    (capped at its own total).
+    """
+    parts = [{} for _ in weights]
+    for stage, entry in stages.items():
+        counts = apportion(entry["count"], weights)
+        for part, count in zip(parts, counts):
+            if not count:
+                continue
+            total = round(entry["total_seconds"] * count / entry["count"], 4)
+            part[stage] = {
+                "count": count,
+                "total_seconds": total,
+                "max_seconds": min(entry["max_seconds"], total),
+                "max_page": entry["max_page"],
+            }
+    return parts
+
+
+class StageTimings:
+    """
+    Totals of timed spans per stage.
+
+    Each stage keeps its span count, total and longest span (with the page
+    label of that span), so the size does not grow with the page count.
+    Spans may be added from several threads (e.g. the OCR renderer).
+    """
+
+    def __init__(self):
+        self.stages: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float, page: Optional[int] = None) -> None:
+        with self._lock:
+            entry = self.stages.setdefault(stage, _empty_entry())
+            entry["count"] += 1
+            entry["total_seconds"] += seconds
+            if seconds > entry["max_seconds"]:
+                entry["max_seconds"] = seconds
+                entry["max_page"] = page
+
+    def merge(self, stages: dict) -> None:
+        """Add the totals of another ``as_dict()`` output."""
+        with self._lock:
+            for stage, other in stages.items():
+                entry = self.stages.setdefault(stage, _empty_entry())
+                entry["count"] += other["count"]
+                entry["total_seconds"] += other["total_seconds"]
+                if other["max_seconds"] > entry["max_seconds"]:
+                    entry["max_seconds"] = other["max_seconds"]
+                    entry["max_page"] = other["max_page"]
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                stage: {
+                    **entry,
+                    "total_seconds": round(entry["total_seconds"], 4),
+                    "max_seconds": round(entry["max_seconds"], 4),
+                }
+                for stage, entry in self.stages.items()
+            }
+
+
+class _Span:
+    __slots__ = ("timings", "stage", "page", "start")
+
+    def __init__(self, timings: StageTimings, stage: str, page: Optional[int]):
+        self.timings = timings
+        self.stage = stage
+        self.page = page
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timings.add(self.stage, time.perf_counter() - self.start, self.page)
+        return False
+
+
+def enable(enabled: bool = True) -> None:
+    """Turn span recording on or off for this process."""
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def span(stage: str, page: Optional[int] = None):
+    """
+    Context manager timing one stage with time.perf_counter.
+
+    Outside a recording() block this returns a shared no-op context
+    manager, so instrumented code costs one global lookup when disabled.
+    """
+    timings = _active
+    if timings is None:
+        return _NULL_SPAN
+    return _Span(timings, stage, page)
+
+
+@contextmanager
+def recording(timings: Optional[StageTimings] = None) -> Iterator[Optional[StageTimings]]:
+    """
+    Send the spans of the enclosed block to ``timings`` (default: a fresh
+    StageTimings) and yield it.
+
+    Yields None (and records nothing) when timing is disabled. Blocks may
+    nest; spans go to the innermost one, whose totals the caller can
+    merge() into the outer one.
+    """
+    global _active
+    if not _enabled:
+        yield None
+        return
+
+    previous = _active
+    _active = timings if timings is not None else StageTimings()
+    try:
+        yield _active
+    finally:
+        _active = previous
@@ -0,0 +1,383 @@
+"""Supervised worker processes with per-task deadlines and recycling."""
+
+from collections import deque
+from dataclasses import dataclass, field
+import multiprocessing
+from multiprocessing.connection import wait
+import os
+import time
+from typing import Any, Callable, Iterator, Optional
+
+try:
+    import psutil
+except ImportError:  # in requirements.txt; without it memory ceilings are not enforced
+    psutil = None
+
+# Connection and task of this process when it is a supervised worker of a
+# pool with deadlines (set by _worker_main); report_progress sends nothing
+# elsewhere
+_conn = None
+_task_id: Optional[int] = None
+# Pages this worker OCR'd over its lifetime ("ocr" report_progress messages)
+_pages_done = 0
+
+
+def rss_mb() -> Optional[float]:
+    """Resident set size of this process in MiB, or None without psutil."""
+    if psutil is None:
+        return None
+    return psutil.Process().memory_info().rss / 2**20
+
+
+def report_progress(kind: str, payload: Any = None) -> None:
+    """
+    Tell the supervisor that the current task made progress.
+
+    Tasks pass it to the extractors as their progress callback
+    (extractors.base.ProgressCallback).
+
+    ``"page"`` means a page finished and ``"pages"`` that the next
+    ``payload`` pages are under way as one step (e.g. a layout batch); both
+    restart the task's page clock, with a budget of one page or ``payload``
+    pages. A ``"page"`` message carries no text unless ``payload`` is given
+    (see reported_pages). ``"ocr"`` adds ``payload`` pages to the count a
+    worker is recycled at (``max_pages``) and is not sent, so it counts
+    without deadlines too. Other kinds are small labels (e.g. the extractor
+    in use) the supervisor keeps the latest of, without touching the clock.
+    Nothing is sent outside a supervised worker or when the pool has no
+    deadlines.
+
+    Args:
+        kind: "page", "pages", "ocr" or a label name
+        payload: Page text, page count or label value
+    """
+    global _pages_done
+    if kind == "ocr":
+        _pages_done += payload
+        return
+    if _conn is None or _task_id is None:
+        return
+    _conn.send(("progress", _task_id, kind, payload))
+
+
+def reported_pages(pages: Iterator[str], keep: bool = False) -> Iterator[str]:
+    """
+    Pass page texts through, reporting each one once it was consumed.
+
+    Args:
+        pages: Page texts
+        keep: Send the page texts to the supervisor too, so a task killed at
+              its deadline can return them; only for bounded page ranges,
+              as the supervisor holds them until the task ends
+    """
+    for page_text in pages:
+        yield page_text
+        report_progress("page", page_text if keep else None)
+
+
+@dataclass
+class TaskOutcome:
+    """How one submitted task ended."""
+
+    task_id: int
+    args: tuple
+    result: Any = None  # return value of the task (None unless it finished)
+    error: Optional[str] = None  # set if the task raised or its worker died
+    timed_out: Optional[str] = None  # "document" or "page" if a deadline killed it
+    pages: int = 0  # pages reported finished
+    page_texts: list = field(default_factory=list)  # texts of kept pages (reported_pages)
+    labels: dict = field(default_factory=dict)  # latest payload per progress kind
+    seconds: float = 0.0
+    recycled: Optional[dict] = None  # recycle event of the worker after this task
+
+    @property
+    def finished(self) -> bool:
+        return self.error is None and self.timed_out is None
+
+
+def _recycle_reason(max_pages: Optional[int], max_rss_mb: Optional[float]) -> Optional[dict]:
+    """Recycle event of this worker if it is over one of its limits, else None."""
+    rss = rss_mb()
+    if max_rss_mb and rss is not None and rss > max_rss_mb:
+        reason = "memory"
+    elif max_pages and _pages_done >= max_pages:
+        reason = "pages"
+    else:
+        return None
+    return {
+        "pid": os.getpid(),
+        "reason": reason,
+        "pages": _pages_done,
+        "rss_mb": None if rss is None else round(rss, 1),
+    }
+
+
+def _worker_main(
+    conn,
+    initializer: Optional[Callable],
+    initargs: tuple,
+    max_pages: Optional[int] = None,
+    max_rss_mb: Optional[float] = None,
+    heartbeats: bool = False,
+) -> None:
+    global _conn, _task_id
+    if heartbeats:
+        _conn = conn
+    if initializer is not None:
+        initializer(*initargs)
+
+    while True:
+        try:
+            item = conn.recv()
+        except EOFError:
+            break
+        if item is None:
+            break
+
+        task_id, fn, args = item
+        _task_id = task_id
+        try:
+            message = ("done", task_id, fn(*args))
+        except BaseException as e:
+            message = ("error", task_id, f"{type(e).__name__}: {e}")
+        _task_id = None
+        # Limits are checked between tasks only, so no work is lost; the
+        # supervisor replaces a worker that exits after its last message
+        recycled = _recycle_reason(max_pages, max_rss_mb)
+        conn.send(message + (recycled,))
+        if recycled is not None:
+            break
+
+
+class _Worker:
+    """One worker process, its pipe and the task it is running."""
+
+    def __init__(self, context, initializer, initargs, max_pages=None, max_rss_mb=None, heartbeats=False):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, initializer, initargs, max_pages, max_rss_mb, heartbeats),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.outcome: Optional[TaskOutcome] = None
+        self.started = 0.0
+        self.task_budgets = 1  # task_timeout budgets of the current task
+        # Page clock: start and budget (in pages) of the current step; not
+        # running until the task's first "page"/"pages" message
+        self.last_progress: Optional[float] = None
+        self.step_pages = 1
+
+    def page_deadline(self, page_timeout: float) -> float:
+        """End of the current step's page budget (page clock running)."""
+        return self.last_progress + page_timeout * self.step_pages
+
+    def assign(self, task_id: int, fn: Callable, args: tuple, budgets: int = 1) -> None:
+        self.outcome = TaskOutcome(task_id=task_id, args=args)
+        self.started = time.perf_counter()
+        self.task_budgets = budgets
+        self.last_progress = None
+        self.conn.send((task_id, fn, args))
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class WorkerPool:
+    """
+    Worker processes that run submitted tasks one at a time each, with
+    deadlines.
+
+    Unlike ProcessPoolExecutor, a worker that stalls or dies only loses its
+    own task: the supervisor kills it (if needed) and starts a replacement
+    with the same initializer, and the rest of the batch carries on. Each
+    worker talks to the supervisor over its own pipe, so killing one never
+    corrupts a queue another worker shares.
+
+    A task is killed when it runs longer than ``task_timeout`` in total
+    (times its ``budgets``, for a task covering several documents), or
+    overruns the page clock: ``page_timeout`` seconds per page between two
+    "page"/"pages" report_progress messages (``payload`` times that for a
+    ``"pages"`` step). The page clock starts with the task's first such
+    message, sent once its extractor is ready, so classification and model
+    loading only count against ``task_timeout``. Workers send progress only
+    when the pool has a deadline.
+
+    A worker that has OCR'd ``max_pages`` pages ("ocr" progress), or whose resident memory
+    exceeds ``max_rss_mb`` (needs psutil), exits after its current task and
+    is replaced by a fresh one that takes over the remaining queue. This
+    bounds slow leaks in native libraries; the event is recorded on the
+    TaskOutcome of the worker's last task.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        initializer: Optional[Callable] = None,
+        initargs: tuple = (),
+        task_timeout: Optional[float] = None,
+        page_timeout: Optional[float] = None,
+        max_pages: Optional[int] = None,
+        max_rss_mb: Optional[float] = None,
+        mp_context=None,
+    ):
+        """
+        Initialize the pool and start its workers.
+
+        Args:
+            workers: Number of worker processes
+            initializer: Optional function every worker (and replacement)
+                         runs once at startup
+            initargs: Arguments of ``initializer``
+            task_timeout: Optional budget of one task in seconds
+            page_timeout: Optional budget of one page in seconds
+            max_pages: Optional number of OCR'd pages ("ocr" progress)
+                       after which a worker is recycled
+            max_rss_mb: Optional resident memory (MiB) above which a worker
+                        is recycled
+            mp_context: Optional multiprocessing context
+        """
+        self._context = mp_context or multiprocessing.get_context()
+        self._initializer = initializer
+        self._initargs = initargs
+        self.task_timeout = task_timeout or None
+        self.page_timeout = page_timeout or None
+        self.max_pages = max_pages or None
+        self.max_rss_mb = max_rss_mb or None
+        self._pending: deque[tuple[int, Callable, tuple, int]] = deque()
+        self._next_id = 0
+        self._workers = [self._start_worker() for _ in range(max(1, workers))]
+
+    def _start_worker(self) -> _Worker:
+        return _Worker(
+            self._context,
+            self._initializer,
+            self._initargs,
+            self.max_pages,
+            self.max_rss_mb,
+            heartbeats=bool(self.task_timeout or self.page_timeout),
+        )
+
+    def submit(self, fn: Callable, *args, first: bool = False, budgets: int = 1) -> int:
+        """
+        Queue ``fn(*args)`` and return its task id.
+
+        Tasks start in submission order, except that ``first=True`` puts the
+        task ahead of every task not started yet. ``budgets`` is the number
+        of ``task_timeout`` budgets the task gets (e.g. one per document it
+        covers). Tasks may also be submitted while ``results()`` is being
+        iterated.
+        """
+        task_id = self._next_id
+        self._next_id += 1
+        if first:
+            self._pending.appendleft((task_id, fn, args, budgets))
+        else:
+            self._pending.append((task_id, fn, args, budgets))
+        return task_id
+
+    def results(self) -> Iterator[TaskOutcome]:
+        """Run the submitted tasks and yield their outcomes in completion order."""
+        while self._pending or any(w.outcome is not None for w in self._workers):
+            for worker in self._workers:
+                if worker.outcome is None and self._pending:
+                    worker.assign(*self._pending.popleft())
+
+            busy = [w for w in self._workers if w.outcome is not None]
+            ready = wait(
+                [w.conn for w in busy] + [w.process.sentinel for w in busy],
+                timeout=self._next_deadline(busy),
+            )
+            for worker in busy:
+                outcome = self._poll(worker, ready)
+                if outcome is not None:
+                    yield outcome
+
+    def _next_deadline(self, busy: list[_Worker]) -> Optional[float]:
+        deadlines = []
+        for worker in busy:
+            if self.task_timeout:
+                deadlines.append(worker.started + self.task_timeout * worker.task_budgets)
+            if self.page_timeout and worker.last_progress is not None:
+                deadlines.append(worker.page_deadline(self.page_timeout))
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines) - time.perf_counter())
+
+    def _poll(self, worker: _Worker, ready: list) -> Optional[TaskOutcome]:
+        """Handle the messages, death or deadline of a busy worker."""
+        outcome = worker.outcome
+        if worker.conn in ready or worker.process.sentinel in ready:
+            try:
+                while worker.conn.poll():
+                    message = worker.conn.recv()
+                    if message[0] == "progress":
+                        _, _, kind, payload = message
+                        if kind == "page":
+                            outcome.pages += 1
+                            if payload is not None:
+                                outcome.page_texts.append(payload)
+                        elif kind != "pages":
+                            outcome.labels[kind] = payload
+                            continue
+                        worker.last_progress = time.perf_counter()
+                        worker.step_pages = payload if kind == "pages" else 1
+                        continue
+
+                    kind, _, value, recycled = message
+                    if kind == "done":
+                        outcome.result = value
+                    else:
+                        outcome.error = value
+                    if recycled is not None:
+                        outcome.recycled = recycled
+                    return self._finish(worker, replace=recycled is not None)
+            except (EOFError, OSError):
+                pass  # the worker died; its exit is handled below
+
+            if not worker.process.is_alive():
+                outcome.error = f"Worker exited with code {worker.process.exitcode}"
+                return self._finish(worker, replace=True)
+
+        now = time.perf_counter()
+        if self.task_timeout and now - worker.started > self.task_timeout * worker.task_budgets:
+            outcome.timed_out = "document"
+        elif self.page_timeout and worker.last_progress is not None and now > worker.page_deadline(self.page_timeout):
+            outcome.timed_out = "page"
+        if outcome.timed_out:
+            return self._finish(worker, replace=True)
+        return None
+
+    def _finish(self, worker: _Worker, replace: bool) -> TaskOutcome:
+        outcome = worker.outcome
+        outcome.seconds = time.perf_counter() - worker.started
+        worker.outcome = None
+        if replace:
+            # A recycled worker exits by itself; kill() reaps it either way
+            worker.kill()
+            self._workers[self._workers.index(worker)] = self._start_worker()
+        return outcome
+
+    def close(self) -> None:
+        """Stop the workers (killing any that are still busy)."""
+        for worker in self._workers:
+            if worker.outcome is None and worker.process.is_alive():
+                try:
+                    worker.conn.send(None)
+                except OSError:
+                    pass
+                worker.process.join(timeout=5)
+            if worker.process.is_alive():
+                worker.process.kill()
+                worker.process.join()
+            worker.conn.close()
+        self._workers = []
+
+    def __enter__(self) -> "WorkerPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()